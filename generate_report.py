@@ -13,14 +13,32 @@ from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
 from reportlab.pdfgen import canvas
 from datetime import datetime
-import os
-import matplotlib.pyplot as plt
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Backend sem GUI: evita sondar Qt/Tk em execução headless
 import matplotlib.patches as patches
+from matplotlib.collections import PatchCollection
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+def _draw_arrows(ax, segments, color, width):
+    """Desenha todas as setas (array N x 2 x 2 de início/fim) numa única chamada"""
+    starts = segments[:, 0]
+    deltas = segments[:, 1] - starts
+    ax.quiver(starts[:, 0], starts[:, 1], deltas[:, 0], deltas[:, 1],
+              angles='xy', scale_units='xy', scale=1, color=color, width=width)
 
 
 def create_architecture_diagram():
-    """Cria diagrama da arquitetura do sistema"""
-    fig, ax = plt.subplots(1, 1, figsize=(12, 8))
+    """Cria diagrama da arquitetura do sistema (PNG em memória)"""
+    # Figure sem pyplot: sem estado global, seguro para renderizar em thread
+    fig = Figure(figsize=(12, 8))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots(1, 1)
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 8)
     ax.axis('off')
@@ -31,25 +49,20 @@ def create_architecture_diagram():
     color_domain = '#F5A623'
     color_infra = '#BD10E0'
 
-    # Camada de Interface (UI)
-    ui_rect = patches.Rectangle((1, 6.5), 8, 1, linewidth=2, edgecolor=color_ui, facecolor=color_ui, alpha=0.3)
-    ax.add_patch(ui_rect)
-    ax.text(5, 7, 'Interface Layer\n(Streamlit + Chat WhatsApp-style)', ha='center', va='center', fontsize=10, weight='bold')
-
-    # Camada de Aplicação
-    app_rect = patches.Rectangle((1, 5), 8, 1.2, linewidth=2, edgecolor=color_app, facecolor=color_app, alpha=0.3)
-    ax.add_patch(app_rect)
-    ax.text(5, 5.6, 'Application Layer\n(Use Cases + Interfaces)', ha='center', va='center', fontsize=10, weight='bold')
-
-    # Camada de Domínio
-    domain_rect = patches.Rectangle((1, 3.5), 8, 1.2, linewidth=2, edgecolor=color_domain, facecolor=color_domain, alpha=0.3)
-    ax.add_patch(domain_rect)
-    ax.text(5, 4.1, 'Domain Layer\n(Entities + Services + Business Logic)', ha='center', va='center', fontsize=10, weight='bold')
-
-    # Camada de Infraestrutura
-    infra_rect = patches.Rectangle((1, 1), 8, 2.2, linewidth=2, edgecolor=color_infra, facecolor=color_infra, alpha=0.3)
-    ax.add_patch(infra_rect)
-    ax.text(5, 2.1, 'Infrastructure Layer\n(Adapters + External Services + DI Container)', ha='center', va='center', fontsize=10, weight='bold')
+    # Camadas (retângulos desenhados numa única coleção)
+    layers = [
+        ((1, 6.5), 1, color_ui, 7, 'Interface Layer\n(Streamlit + Chat WhatsApp-style)'),
+        ((1, 5), 1.2, color_app, 5.6, 'Application Layer\n(Use Cases + Interfaces)'),
+        ((1, 3.5), 1.2, color_domain, 4.1, 'Domain Layer\n(Entities + Services + Business Logic)'),
+        ((1, 1), 2.2, color_infra, 2.1, 'Infrastructure Layer\n(Adapters + External Services + DI Container)')
+    ]
+    layer_colors = [color for _, _, color, _, _ in layers]
+    ax.add_collection(PatchCollection(
+        [patches.Rectangle(xy, 8, height) for xy, height, _, _, _ in layers],
+        facecolors=layer_colors, edgecolors=layer_colors, linewidths=2, alpha=0.3
+    ))
+    for _, _, _, text_y, text in layers:
+        ax.text(5, text_y, text, ha='center', va='center', fontsize=10, weight='bold')
 
     # Componentes específicos
     components = [
@@ -59,28 +72,36 @@ def create_architecture_diagram():
         (8, 1.5, 'Memory\nSystem')
     ]
 
+    ax.add_collection(PatchCollection(
+        [patches.Rectangle((x-0.4, y-0.3), 0.8, 0.6) for x, y, _ in components],
+        facecolors='white', edgecolors='black', linewidths=1, alpha=0.8
+    ))
     for x, y, text in components:
-        comp_rect = patches.Rectangle((x-0.4, y-0.3), 0.8, 0.6, linewidth=1, edgecolor='black', facecolor='white', alpha=0.8)
-        ax.add_patch(comp_rect)
         ax.text(x, y, text, ha='center', va='center', fontsize=8)
 
-    # Setas de dependência
-    arrow_props = dict(arrowstyle='->', connectionstyle='arc3', color='gray', lw=1.5)
-    ax.annotate('', xy=(5, 6.4), xytext=(5, 6.2), arrowprops=arrow_props)
-    ax.annotate('', xy=(5, 4.9), xytext=(5, 4.7), arrowprops=arrow_props)
-    ax.annotate('', xy=(5, 3.4), xytext=(5, 3.2), arrowprops=arrow_props)
+    # Setas de dependência (um único quiver desenha hastes e pontas)
+    arrows = np.array([
+        ((5, 6.2), (5, 6.4)),
+        ((5, 4.7), (5, 4.9)),
+        ((5, 3.2), (5, 3.4))
+    ])
+    _draw_arrows(ax, arrows, color='gray', width=0.0025)
 
     ax.set_title('CSVEDA - Clean Architecture com Agentes Autônomos', fontsize=14, weight='bold', pad=20)
 
-    plt.tight_layout()
-    plt.savefig('architecture_diagram.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    return 'architecture_diagram.png'
+    fig.tight_layout()
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=150, bbox_inches='tight')
+    buf.seek(0)
+    return buf
 
 
 def create_agent_flow_diagram():
-    """Cria diagrama do fluxo dos agentes"""
-    fig, ax = plt.subplots(1, 1, figsize=(12, 10))
+    """Cria diagrama do fluxo dos agentes (PNG em memória)"""
+    # Figure sem pyplot: sem estado global, seguro para renderizar em thread
+    fig = Figure(figsize=(12, 10))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots(1, 1)
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 10)
     ax.axis('off')
@@ -100,9 +121,12 @@ def create_agent_flow_diagram():
     ]
 
     # Desenhar componentes
-    for x, y, text, color in components:
-        circle = patches.Circle((x, y), 0.6, linewidth=2, edgecolor='black', facecolor=color, alpha=0.7)
-        ax.add_patch(circle)
+    ax.add_collection(PatchCollection(
+        [patches.Circle((x, y), 0.6) for x, y, _, _ in components],
+        facecolors=[color for _, _, _, color in components],
+        edgecolors='black', linewidths=2, alpha=0.7
+    ))
+    for x, y, text, _ in components:
         ax.text(x, y, text, ha='center', va='center', fontsize=9, weight='bold')
 
     # Desenhar fluxos
@@ -120,9 +144,7 @@ def create_agent_flow_diagram():
         ((7, 2.4), (5, 2.1))   # Visualizações -> Resposta
     ]
 
-    arrow_props = dict(arrowstyle='->', connectionstyle='arc3', color='#2C3E50', lw=2)
-    for start, end in flows:
-        ax.annotate('', xy=end, xytext=start, arrowprops=arrow_props)
+    _draw_arrows(ax, np.array(flows), color='#2C3E50', width=0.003)
 
     # Adicionar labels especiais
     ax.text(0.5, 4.5, 'Contexto\nHistórico', ha='center', va='center', fontsize=8,
@@ -132,36 +154,22 @@ def create_agent_flow_diagram():
 
     ax.set_title('Fluxo de Processamento dos Agentes Autônomos', fontsize=14, weight='bold', pad=20)
 
-    plt.tight_layout()
-    plt.savefig('agent_flow_diagram.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    return 'agent_flow_diagram.png'
-
+    fig.tight_layout()
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=150, bbox_inches='tight')
+    buf.seek(0)
+    return buf
 
-def generate_report():
-    """Gera o relatório PDF completo"""
 
-    # Criar diagramas
-    arch_diagram = create_architecture_diagram()
-    flow_diagram = create_agent_flow_diagram()
-
-    # Configuração do documento
-    doc = SimpleDocTemplate(
-        "Agentes Autônomos – Relatório da Atividade Extra.pdf",
-        pagesize=A4,
-        rightMargin=72,
-        leftMargin=72,
-        topMargin=72,
-        bottomMargin=18
-    )
-
-    # Estilos
-    styles = getSampleStyleSheet()
+@lru_cache(maxsize=1)
+def _build_styles():
+    """Constrói (uma única vez) os estilos de parágrafo e de tabela do relatório"""
+    sample = getSampleStyleSheet()
 
     # Estilos customizados
     title_style = ParagraphStyle(
         'CustomTitle',
-        parent=styles['Heading1'],
+        parent=sample['Heading1'],
         fontSize=18,
         spaceAfter=30,
         alignment=TA_CENTER,
@@ -170,7 +178,7 @@ def generate_report():
 
     heading_style = ParagraphStyle(
         'CustomHeading',
-        parent=styles['Heading2'],
+        parent=sample['Heading2'],
         fontSize=14,
         spaceAfter=12,
         spaceBefore=20,
@@ -179,7 +187,7 @@ def generate_report():
 
     subheading_style = ParagraphStyle(
         'CustomSubHeading',
-        parent=styles['Heading3'],
+        parent=sample['Heading3'],
         fontSize=12,
         spaceAfter=8,
         spaceBefore=12,
@@ -188,7 +196,7 @@ def generate_report():
 
     normal_style = ParagraphStyle(
         'CustomNormal',
-        parent=styles['Normal'],
+        parent=sample['Normal'],
         fontSize=11,
         spaceAfter=12,
         alignment=TA_JUSTIFY,
@@ -196,24 +204,7 @@ def generate_report():
         rightIndent=0
     )
 
-    # Construir o conteúdo
-    story = []
-
-    # Título principal
-    story.append(Paragraph("Agentes Autônomos", title_style))
-    story.append(Paragraph("Relatório da Atividade Extra", title_style))
-    story.append(Spacer(1, 20))
-
-    # Informações do projeto
-    info_data = [
-        ['Sistema:', 'CSVEDA - Análise Exploratória de Dados com IA'],
-        ['Desenvolvedor:', 'Claude Code'],
-        ['Data:', datetime.now().strftime('%d/%m/%Y')],
-        ['Versão:', '1.0.0']
-    ]
-
-    info_table = Table(info_data, colWidths=[2*inch, 4*inch])
-    info_table.setStyle(TableStyle([
+    info_table_style = TableStyle([
         ('BACKGROUND', (0,0), (0,-1), HexColor('#ECF0F1')),
         ('TEXTCOLOR', (0,0), (-1,-1), colors.black),
         ('ALIGN', (0,0), (-1,-1), 'LEFT'),
@@ -221,38 +212,9 @@ def generate_report():
         ('FONTSIZE', (0,0), (-1,-1), 10),
         ('BOTTOMPADDING', (0,0), (-1,-1), 12),
         ('GRID', (0,0), (-1,-1), 1, colors.black)
-    ]))
-
-    story.append(info_table)
-    story.append(Spacer(1, 30))
-
-    # 1. Framework Escolhida
-    story.append(Paragraph("1. Framework Escolhida", heading_style))
-
-    framework_text = """
-    A solução foi desenvolvida utilizando uma arquitetura moderna baseada em múltiplas tecnologias integradas:
-    """
-    story.append(Paragraph(framework_text, normal_style))
-
-    # Tabela de frameworks
-    framework_data = [
-        ['Componente', 'Framework/Tecnologia', 'Versão', 'Finalidade'],
-        ['Interface de Usuário', 'Streamlit', '1.28+', 'Interface web responsiva com chat WhatsApp-style'],
-        ['Agentes Autônomos', 'LangChain', '0.1+', 'Framework para construção de agentes com LLM'],
-        ['Modelo de Linguagem', 'Google Gemini', '2.5', 'Processamento de linguagem natural e geração de código'],
-        ['Alternativa LLM', 'Mistral via Ollama', 'Latest', 'Modelo local para redundância'],
-        ['Processamento de Dados', 'Pandas + NumPy', '2.1+', 'Manipulação e análise de datasets CSV'],
-        ['Visualizações', 'Matplotlib + Seaborn', '5.17+', 'Geração automática de gráficos'],
-        ['Arquitetura', 'Clean Architecture', 'Custom', 'Separação de responsabilidades e testabilidade'],
-        ['Injeção de Dependências', 'DI Container Custom', '1.0', 'Inversão de controle e modularidade'],
-        ['Logging', 'Loguru', '0.7+', 'Logging estruturado em JSON'],
-        ['Configuração', 'Pydantic + Python-decouple', '2.5+', 'Gestão de configurações externa'],
-        ['Testes', 'Pytest', '7.4+', 'Testes unitários e de integração'],
-        ['CI/CD', 'GitHub Actions', 'Latest', 'Pipeline de integração e deploy contínuo']
-    ]
+    ])
 
-    framework_table = Table(framework_data, colWidths=[1.5*inch, 1.8*inch, 0.8*inch, 2.2*inch])
-    framework_table.setStyle(TableStyle([
+    framework_table_style = TableStyle([
         ('BACKGROUND', (0,0), (-1,0), HexColor('#3498DB')),
         ('TEXTCOLOR', (0,0), (-1,0), colors.white),
         ('ALIGN', (0,0), (-1,-1), 'LEFT'),
@@ -262,13 +224,36 @@ def generate_report():
         ('BOTTOMPADDING', (0,0), (-1,-1), 8),
         ('GRID', (0,0), (-1,-1), 1, colors.black),
         ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, HexColor('#F8F9FA')])
-    ]))
+    ])
 
-    story.append(framework_table)
-    story.append(Spacer(1, 20))
+    caracteristicas_table_style = TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), HexColor('#E74C3C')),
+        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
+        ('FONTSIZE', (0,0), (-1,-1), 9),
+        ('BOTTOMPADDING', (0,0), (-1,-1), 8),
+        ('GRID', (0,0), (-1,-1), 1, colors.black),
+        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, HexColor('#FDEDEC')])
+    ])
 
-    # Justificativa da escolha
-    justificativa_text = """
+    return {
+        'title': title_style,
+        'heading': heading_style,
+        'subheading': subheading_style,
+        'normal': normal_style,
+        'info_table': info_table_style,
+        'framework_table': framework_table_style,
+        'caracteristicas_table': caracteristicas_table_style,
+    }
+
+
+_FRAMEWORK_TEXT = """
+    A solução foi desenvolvida utilizando uma arquitetura moderna baseada em múltiplas tecnologias integradas:
+    """
+
+_JUSTIFICATIVA_TEXT = """
     <b>Justificativa das Escolhas:</b><br/>
     • <b>LangChain</b>: Framework líder para desenvolvimento de agentes autônomos com LLM, oferecendo padrões ReAct, ferramentas integradas e gestão de memória.<br/>
     • <b>Google Gemini</b>: Modelo de linguagem de última geração com capacidades avançadas de geração de código e análise de dados.<br/>
@@ -276,26 +261,13 @@ def generate_report():
     • <b>Clean Architecture</b>: Padrão arquitetural que promove separação de responsabilidades, testabilidade e manutenibilidade.<br/>
     • <b>Pandas</b>: Biblioteca padrão da indústria para manipulação de dados estruturados em Python.
     """
-    story.append(Paragraph(justificativa_text, normal_style))
-    story.append(PageBreak())
 
-    # 2. Como a Solução foi Estruturada
-    story.append(Paragraph("2. Como a Solução foi Estruturada", heading_style))
-
-    estrutura_text = """
+_ESTRUTURA_TEXT = """
     A solução segue os princípios da Clean Architecture, implementando separação clara de responsabilidades
     através de camadas bem definidas. O sistema foi projetado para ser modular, testável e extensível.
     """
-    story.append(Paragraph(estrutura_text, normal_style))
-
-    # Diagrama de arquitetura
-    story.append(Paragraph("2.1. Arquitetura do Sistema", subheading_style))
-    if os.path.exists(arch_diagram):
-        story.append(Image(arch_diagram, width=6*inch, height=4*inch))
-    story.append(Spacer(1, 15))
 
-    # Descrição das camadas
-    camadas_text = """
+_CAMADAS_TEXT = """
     <b>Estrutura em Camadas:</b><br/><br/>
     <b>1. Interface Layer (Apresentação):</b><br/>
     • Interface web desenvolvida em Streamlit com design WhatsApp-style<br/>
@@ -321,16 +293,8 @@ def generate_report():
     • DI Container para injeção de dependências<br/>
     • Integração com APIs externas (Gemini, Ollama)
     """
-    story.append(Paragraph(camadas_text, normal_style))
-    story.append(PageBreak())
-
-    # Fluxo dos agentes
-    story.append(Paragraph("2.2. Fluxo de Processamento dos Agentes", subheading_style))
-    if os.path.exists(flow_diagram):
-        story.append(Image(flow_diagram, width=6*inch, height=5*inch))
-    story.append(Spacer(1, 15))
 
-    agentes_text = """
+_AGENTES_TEXT = """
     <b>Sistema de Agentes Autônomos:</b><br/><br/>
 
     <b>EDA Agent (Agente Principal):</b><br/>
@@ -356,13 +320,8 @@ def generate_report():
     • Categoriza automaticamente tipos de análise realizadas<br/>
     • Permite síntese inteligente de múltiplas análises
     """
-    story.append(Paragraph(agentes_text, normal_style))
-    story.append(PageBreak())
 
-    # Estrutura de diretórios
-    story.append(Paragraph("2.3. Estrutura de Diretórios", subheading_style))
-
-    estrutura_dir = """
+_ESTRUTURA_DIR = """
     <b>Organização do Código:</b><br/><br/>
     <font name="Courier">
     CSVEDA/<br/>
@@ -390,45 +349,8 @@ def generate_report():
     └── .env.example               # Template de configuração
     </font>
     """
-    story.append(Paragraph(estrutura_dir, normal_style))
-    story.append(Spacer(1, 20))
-
-    # Características técnicas
-    story.append(Paragraph("2.4. Características Técnicas Implementadas", subheading_style))
-
-    caracteristicas_data = [
-        ['Funcionalidade', 'Implementação', 'Benefício'],
-        ['Logging Estruturado', 'Loguru com formato JSON', 'Auditoria e debug avançado'],
-        ['Configuração Externa', 'Pydantic + .env', 'Deployment flexível'],
-        ['Testes Automatizados', 'Pytest com fixtures', 'Qualidade e confiabilidade'],
-        ['CI/CD Pipeline', 'GitHub Actions', 'Integração e deploy contínuo'],
-        ['Sistema de Memória', 'ConversationSummaryBufferMemory', 'Contexto entre perguntas'],
-        ['Geração de Código', 'LLM dinâmico + execução segura', 'Análises personalizadas'],
-        ['Tratamento de Erros', 'Fallbacks inteligentes', 'Robustez e disponibilidade'],
-        ['Arquitetura Limpa', 'Separação de camadas', 'Manutenibilidade'],
-        ['DI Container', 'Injeção de dependências', 'Testabilidade e modularidade']
-    ]
-
-    caracteristicas_table = Table(caracteristicas_data, colWidths=[2*inch, 2.3*inch, 2*inch])
-    caracteristicas_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), HexColor('#E74C3C')),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 9),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 8),
-        ('GRID', (0,0), (-1,-1), 1, colors.black),
-        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, HexColor('#FDEDEC')])
-    ]))
-
-    story.append(caracteristicas_table)
-    story.append(PageBreak())
 
-    # Inovações implementadas
-    story.append(Paragraph("2.5. Inovações e Diferenciais", subheading_style))
-
-    inovacoes_text = """
+_INOVACOES_TEXT = """
     <b>Principais Inovações Implementadas:</b><br/><br/>
 
     <b>1. Sistema de Memória Contextual:</b><br/>
@@ -462,13 +384,8 @@ def generate_report():
     • Validação de dados em múltiplas camadas<br/>
     • Tratamento específico de erros conhecidos
     """
-    story.append(Paragraph(inovacoes_text, normal_style))
-    story.append(Spacer(1, 20))
 
-    # Conclusão
-    story.append(Paragraph("3. Conclusão", heading_style))
-
-    conclusao_text = """
+_CONCLUSAO_TEXT = """
     O sistema CSVEDA representa uma implementação avançada de agentes autônomos para análise exploratória
     de dados, combinando as melhores práticas de engenharia de software com tecnologias de IA de ponta.
     <br/><br/>
@@ -483,16 +400,170 @@ def generate_report():
     construindo conhecimento incrementalmente e fornecendo análises cada vez mais sofisticadas
     conforme a conversa evolui.
     """
-    story.append(Paragraph(conclusao_text, normal_style))
+
+_STATIC_TEXTS = {
+    'framework_text': _FRAMEWORK_TEXT,
+    'justificativa_text': _JUSTIFICATIVA_TEXT,
+    'estrutura_text': _ESTRUTURA_TEXT,
+    'camadas_text': _CAMADAS_TEXT,
+    'agentes_text': _AGENTES_TEXT,
+    'estrutura_dir': _ESTRUTURA_DIR,
+    'inovacoes_text': _INOVACOES_TEXT,
+    'conclusao_text': _CONCLUSAO_TEXT,
+}
+
+
+@lru_cache(maxsize=1)
+def _build_static_paragraphs():
+    """Faz o parse (uma única vez) dos blocos de texto fixos do relatório"""
+    normal_style = _build_styles()['normal']
+    return {name: Paragraph(text, normal_style) for name, text in _STATIC_TEXTS.items()}
+
+
+def generate_report():
+    """Gera o relatório PDF completo"""
+
+    # Criar diagramas em paralelo com a montagem do documento
+    executor = ThreadPoolExecutor(max_workers=2)
+    arch_future = executor.submit(create_architecture_diagram)
+    flow_future = executor.submit(create_agent_flow_diagram)
+    executor.shutdown(wait=False)
+
+    # Configuração do documento
+    doc = SimpleDocTemplate(
+        "Agentes Autônomos – Relatório da Atividade Extra.pdf",
+        pagesize=A4,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=18
+    )
+
+    # Estilos (construídos uma vez e reutilizados entre chamadas)
+    styles = _build_styles()
+    title_style = styles['title']
+    heading_style = styles['heading']
+    subheading_style = styles['subheading']
+    paragraphs = _build_static_paragraphs()
+
+    # Construir o conteúdo
+    story = []
+
+    # Título principal
+    story.append(Paragraph("Agentes Autônomos", title_style))
+    story.append(Paragraph("Relatório da Atividade Extra", title_style))
+    story.append(Spacer(1, 20))
+
+    # Informações do projeto
+    info_data = [
+        ['Sistema:', 'CSVEDA - Análise Exploratória de Dados com IA'],
+        ['Desenvolvedor:', 'Claude Code'],
+        ['Data:', datetime.now().strftime('%d/%m/%Y')],
+        ['Versão:', '1.0.0']
+    ]
+
+    info_table = Table(info_data, colWidths=[2*inch, 4*inch])
+    info_table.setStyle(styles['info_table'])
+
+    story.append(info_table)
+    story.append(Spacer(1, 30))
+
+    # 1. Framework Escolhida
+    story.append(Paragraph("1. Framework Escolhida", heading_style))
+
+    story.append(paragraphs['framework_text'])
+
+    # Tabela de frameworks
+    framework_data = [
+        ['Componente', 'Framework/Tecnologia', 'Versão', 'Finalidade'],
+        ['Interface de Usuário', 'Streamlit', '1.28+', 'Interface web responsiva com chat WhatsApp-style'],
+        ['Agentes Autônomos', 'LangChain', '0.1+', 'Framework para construção de agentes com LLM'],
+        ['Modelo de Linguagem', 'Google Gemini', '2.5', 'Processamento de linguagem natural e geração de código'],
+        ['Alternativa LLM', 'Mistral via Ollama', 'Latest', 'Modelo local para redundância'],
+        ['Processamento de Dados', 'Pandas + NumPy', '2.1+', 'Manipulação e análise de datasets CSV'],
+        ['Visualizações', 'Matplotlib + Seaborn', '5.17+', 'Geração automática de gráficos'],
+        ['Arquitetura', 'Clean Architecture', 'Custom', 'Separação de responsabilidades e testabilidade'],
+        ['Injeção de Dependências', 'DI Container Custom', '1.0', 'Inversão de controle e modularidade'],
+        ['Logging', 'Loguru', '0.7+', 'Logging estruturado em JSON'],
+        ['Configuração', 'Pydantic + Python-decouple', '2.5+', 'Gestão de configurações externa'],
+        ['Testes', 'Pytest', '7.4+', 'Testes unitários e de integração'],
+        ['CI/CD', 'GitHub Actions', 'Latest', 'Pipeline de integração e deploy contínuo']
+    ]
+
+    framework_table = Table(framework_data, colWidths=[1.5*inch, 1.8*inch, 0.8*inch, 2.2*inch])
+    framework_table.setStyle(styles['framework_table'])
+
+    story.append(framework_table)
+    story.append(Spacer(1, 20))
+
+    # Justificativa da escolha
+    story.append(paragraphs['justificativa_text'])
+    story.append(PageBreak())
+
+    # 2. Como a Solução foi Estruturada
+    story.append(Paragraph("2. Como a Solução foi Estruturada", heading_style))
+
+    story.append(paragraphs['estrutura_text'])
+
+    # Diagrama de arquitetura
+    story.append(Paragraph("2.1. Arquitetura do Sistema", subheading_style))
+    story.append(Image(arch_future.result(), width=6*inch, height=4*inch))
+    story.append(Spacer(1, 15))
+
+    # Descrição das camadas
+    story.append(paragraphs['camadas_text'])
+    story.append(PageBreak())
+
+    # Fluxo dos agentes
+    story.append(Paragraph("2.2. Fluxo de Processamento dos Agentes", subheading_style))
+    story.append(Image(flow_future.result(), width=6*inch, height=5*inch))
+    story.append(Spacer(1, 15))
+
+    story.append(paragraphs['agentes_text'])
+    story.append(PageBreak())
+
+    # Estrutura de diretórios
+    story.append(Paragraph("2.3. Estrutura de Diretórios", subheading_style))
+
+    story.append(paragraphs['estrutura_dir'])
+    story.append(Spacer(1, 20))
+
+    # Características técnicas
+    story.append(Paragraph("2.4. Características Técnicas Implementadas", subheading_style))
+
+    caracteristicas_data = [
+        ['Funcionalidade', 'Implementação', 'Benefício'],
+        ['Logging Estruturado', 'Loguru com formato JSON', 'Auditoria e debug avançado'],
+        ['Configuração Externa', 'Pydantic + .env', 'Deployment flexível'],
+        ['Testes Automatizados', 'Pytest com fixtures', 'Qualidade e confiabilidade'],
+        ['CI/CD Pipeline', 'GitHub Actions', 'Integração e deploy contínuo'],
+        ['Sistema de Memória', 'ConversationSummaryBufferMemory', 'Contexto entre perguntas'],
+        ['Geração de Código', 'LLM dinâmico + execução segura', 'Análises personalizadas'],
+        ['Tratamento de Erros', 'Fallbacks inteligentes', 'Robustez e disponibilidade'],
+        ['Arquitetura Limpa', 'Separação de camadas', 'Manutenibilidade'],
+        ['DI Container', 'Injeção de dependências', 'Testabilidade e modularidade']
+    ]
+
+    caracteristicas_table = Table(caracteristicas_data, colWidths=[2*inch, 2.3*inch, 2*inch])
+    caracteristicas_table.setStyle(styles['caracteristicas_table'])
+
+    story.append(caracteristicas_table)
+    story.append(PageBreak())
+
+    # Inovações implementadas
+    story.append(Paragraph("2.5. Inovações e Diferenciais", subheading_style))
+
+    story.append(paragraphs['inovacoes_text'])
+    story.append(Spacer(1, 20))
+
+    # Conclusão
+    story.append(Paragraph("3. Conclusão", heading_style))
+
+    story.append(paragraphs['conclusao_text'])
 
     # Gerar PDF
     doc.build(story)
 
-    # Limpar arquivos temporários
-    for file in [arch_diagram, flow_diagram]:
-        if os.path.exists(file):
-            os.remove(file)
-
     print("Relatorio PDF gerado com sucesso: 'Agentes Autonomos - Relatorio da Atividade Extra.pdf'")
 
 
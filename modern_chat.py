@@ -1,220 +1,598 @@
 import streamlit as st
+import os
 import sqlite3
 import json
 import base64
 from datetime import datetime
 from pathlib import Path
 import pandas as pd
-import plotly.graph_objects as go
-from io import BytesIO
+import pyarrow as pa
+import plotly.io as pio
+from io import BytesIO, StringIO
 import uuid
+import time
+import threading
+import queue
+import textwrap
+import html
+import hashlib
+import logging
+from functools import lru_cache
+
+# pybase64 (opcional) usa codificador SIMD; mesma API do módulo base64
+try:
+    import pybase64 as _b64
+except ImportError:
+    _b64 = base64
+
+# orjson (opcional) acelera o JSON das mensagens e das figuras Plotly
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    pio.json.config.default_engine = "orjson"
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+# Pillow (opcional; já vem com o matplotlib) converte os gráficos para WebP
+try:
+    from PIL import Image, features as _pil_features
+except ImportError:
+    Image = None
+
+# Fragments (Streamlit >= 1.33) limitam o rerun ao trecho que mudou;
+# em versões anteriores o decorator é neutro e o app inteiro reroda
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+
+def _rerun_fragment():
+    """Reroda só o fragment atual quando suportado (Streamlit >= 1.37)"""
+    try:
+        st.rerun(scope="fragment")
+    except TypeError:
+        st.rerun()
 
 # =====================================================
 # DATABASE MANAGER - Histórico Persistente
 # =====================================================
 
+_INSERT_MESSAGE_SQL = """
+    INSERT INTO conversations VALUES (?, ?, ?, ?, ?, ?, json(?))
+"""
+
+logger = logging.getLogger(__name__)
+
+
 class ChatHistoryDB:
+    # Gravação assíncrona: lotes de até 50 mensagens ou 50 ms de espera
+    WRITE_BATCH_SIZE = 50
+    WRITE_BATCH_INTERVAL = 0.05
+    WRITE_QUEUE_MAXSIZE = 1000
+
     def __init__(self, db_path="chat_history.db"):
         self.db_path = db_path
+        # Conexão única compartilhada entre reruns (threads) do Streamlit
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
         self.init_db()
 
+        self._write_queue = queue.Queue(maxsize=self.WRITE_QUEUE_MAXSIZE)
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+
     def init_db(self):
-        conn = sqlite3.connect(self.db_path)
+        with self._lock:
+            self._init_schema()
+
+    def _init_schema(self):
+        conn = self.conn
         cursor = conn.cursor()
+
+        # Bancos antigos guardam timestamp ISO em coluna TEXT: recria como INTEGER (ns)
+        columns = {row[1]: row[2] for row in cursor.execute("PRAGMA table_info(conversations)")}
+        legacy = columns.get('timestamp') == 'TEXT'
+        if legacy:
+            cursor.execute("DROP INDEX IF EXISTS idx_meta_kind")
+            cursor.execute("ALTER TABLE conversations RENAME TO conversations_legacy")
+
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS conversations (
                 id TEXT PRIMARY KEY,
                 session_id TEXT,
-                timestamp TEXT,
+                timestamp INTEGER,
                 role TEXT,
                 content TEXT,
                 content_type TEXT,
-                metadata TEXT
+                metadata TEXT CHECK (json_valid(metadata))
             )
         """)
+
+        if legacy:
+            rows = cursor.execute("SELECT * FROM conversations_legacy").fetchall()
+            cursor.executemany(
+                "INSERT INTO conversations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (msg_id, session_id, int(datetime.fromisoformat(ts).timestamp() * 1e9),
+                     role, content, content_type, metadata)
+                    for msg_id, session_id, ts, role, content, content_type, metadata in rows
+                ]
+            )
+            cursor.execute("DROP TABLE conversations_legacy")
+
+        # Índice de expressão JSON1: filtros por metadata.kind sem parse em Python
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_meta_kind
+            ON conversations (json_extract(metadata, '$.kind'))
+        """)
+        # Índice da paginação por sessão (keyset em timestamp)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conv_session_ts
+            ON conversations (session_id, timestamp)
+        """)
         conn.commit()
-        conn.close()
+        cursor.execute("PRAGMA optimize")
 
-    def save_message(self, session_id, role, content, content_type="text", metadata=None):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    @staticmethod
+    def _message_row(session_id, role, content, content_type, metadata):
         msg_id = str(uuid.uuid4())
-        cursor.execute("""
-            INSERT INTO conversations VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
+        # Metadata já serializada é repassada como está; json() valida e normaliza
+        if not isinstance(metadata, str):
+            metadata = _json_dumps(metadata or {})
+        return (
             msg_id,
             session_id,
-            datetime.now().isoformat(),
+            time.time_ns(),
             role,
             content,
             content_type,
-            json.dumps(metadata or {})
-        ))
-        conn.commit()
-        conn.close()
-        return msg_id
+            metadata
+        )
 
-    def get_session_history(self, session_id, limit=100):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM conversations
-            WHERE session_id = ?
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """, (session_id, limit))
-        messages = cursor.fetchall()
-        conn.close()
+    def save_message(self, session_id, role, content, content_type="text", metadata=None):
+        row = self._message_row(session_id, role, content, content_type, metadata)
+        with self._lock:
+            self.conn.execute(_INSERT_MESSAGE_SQL, row)
+            self.conn.commit()
+        return row[0]
+
+    def enqueue_message(self, session_id, role, content, content_type="text", metadata=None):
+        """Agenda a gravação para a thread de escrita e retorna sem esperar o commit"""
+        row = self._message_row(session_id, role, content, content_type, metadata)
+        self._write_queue.put(row)
+        return row[0]
+
+    def flush(self):
+        """Aguarda a gravação de todas as mensagens enfileiradas"""
+        self._write_queue.join()
+
+    def _writer_loop(self):
+        while True:
+            batch = [self._write_queue.get()]
+            deadline = time.monotonic() + self.WRITE_BATCH_INTERVAL
+            while len(batch) < self.WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._write_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+
+    def _write_batch(self, batch):
+        """Grava o lote numa transação; se falhar, regrava linha a linha
+
+        Assim só a mensagem inválida é descartada (com id e sessão no log),
+        não o lote inteiro.
+        """
+        with self._lock:
+            try:
+                self.conn.executemany(_INSERT_MESSAGE_SQL, batch)
+                self.conn.commit()
+                return
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                logger.warning("Erro ao gravar lote de %d mensagens (%s); gravando uma a uma",
+                               len(batch), e)
+
+            for row in batch:
+                try:
+                    self.conn.execute(_INSERT_MESSAGE_SQL, row)
+                except sqlite3.Error as e:
+                    logger.error("Mensagem descartada do histórico (id=%s, sessão=%s): %s",
+                                 row[0], row[1], e)
+            try:
+                self.conn.commit()
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                logger.error("Mensagens descartadas do histórico (ids=%s): %s",
+                             [row[0] for row in batch], e)
+
+    def get_session_history(self, session_id, limit=100, before=None):
+        """Página de até `limit` mensagens, em ordem cronológica.
+
+        `before` (timestamp) busca a página anterior à mensagem mais antiga já carregada.
+        """
+        self.flush()
+        with self._lock:
+            messages = self.conn.execute("""
+                SELECT * FROM conversations
+                WHERE session_id = ? AND (? IS NULL OR timestamp < ?)
+                ORDER BY timestamp DESC
+                LIMIT ?
+            """, (session_id, before, before, limit)).fetchall()
         return list(reversed(messages))
 
-    def export_conversation(self, session_id):
-        messages = self.get_session_history(session_id, limit=10000)
-        return json.dumps([{
-            "id": m[0],
-            "timestamp": m[2],
-            "role": m[3],
-            "content": m[4],
-            "type": m[5]
-        } for m in messages], indent=2)
+    def get_messages_by_kind(self, kind, session_id=None):
+        """Busca mensagens pelo campo metadata.kind (usa idx_meta_kind)"""
+        query = """
+            SELECT * FROM conversations
+            WHERE json_extract(metadata, '$.kind') = ?
+        """
+        params = [kind]
+        if session_id is not None:
+            query += " AND session_id = ?"
+            params.append(session_id)
+        query += " ORDER BY timestamp"
+
+        self.flush()
+        with self._lock:
+            return self.conn.execute(query, params).fetchall()
+
+    def export_conversation(self, session_id, out=None):
+        """Exporta a conversa como JSON, escrevendo registro a registro em `out`.
+
+        Sem `out`, retorna o JSON como string.
+        """
+        if out is None:
+            buffer = StringIO()
+            self.export_conversation(session_id, buffer)
+            return buffer.getvalue()
+
+        self.flush()
+        with self._lock:
+            cursor = self.conn.execute("""
+                SELECT id, timestamp, role, content, content_type
+                FROM conversations
+                WHERE session_id = ?
+                ORDER BY timestamp
+            """, (session_id,))
+
+            # Mesmo layout de json.dumps(lista, indent=2), sem materializar a lista
+            separator = "[\n"
+            for msg_id, timestamp, role, content, content_type in cursor:
+                record = json.dumps({
+                    "id": msg_id,
+                    "timestamp": datetime.fromtimestamp(timestamp / 1e9).isoformat(),
+                    "role": role,
+                    "content": content,
+                    "type": content_type
+                }, indent=2)
+                out.write(separator)
+                out.write(textwrap.indent(record, "  "))
+                separator = ",\n"
+            out.write("[]" if separator == "[\n" else "\n]")
+        return out
+
+# =====================================================
+# SERIALIZAÇÃO - DataFrames em Arrow IPC
+# =====================================================
+
+def serialize_df(df):
+    """Serializa DataFrame no formato Arrow IPC (stream)"""
+    table = pa.Table.from_pandas(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def deserialize_df(raw):
+    """Reconstrói DataFrame a partir de bytes Arrow IPC"""
+    return pa.ipc.open_stream(BytesIO(raw)).read_pandas()
+
+# =====================================================
+# BLOB STORE - Payloads grandes fora do SQLite
+# =====================================================
+
+BLOB_DIR = Path("blobs")
+
+
+def _blob_store(payload):
+    """Grava o payload (bytes) endereçado por hash e retorna o id hexadecimal"""
+    blob_id = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    path = BLOB_DIR / f"{blob_id}.bin"
+    if not path.exists():
+        BLOB_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(payload)
+    return blob_id
+
+
+def _blob_load(blob_id):
+    """Lê o payload gravado por _blob_store"""
+    return (BLOB_DIR / f"{blob_id}.bin").read_bytes()
+
+# =====================================================
+# IMAGE STORE - Imagens servidas por URL estática
+# =====================================================
+
+def _image_digest(image_bytes):
+    return hashlib.sha1(image_bytes).hexdigest()
+
+
+class ImageStore:
+    """Armazena imagens por hash de conteúdo no diretório estático do Streamlit"""
+    STATIC_DIR = Path("static") / "img"
+    URL_PREFIX = "app/static/img"
+
+    @classmethod
+    def put(cls, image_bytes):
+        """Grava a imagem uma única vez e retorna a URL servida"""
+        digest = _image_digest(image_bytes)
+        path = cls.STATIC_DIR / f"{digest}.png"
+        if not path.exists():
+            cls.STATIC_DIR.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(image_bytes)
+        return f"{cls.URL_PREFIX}/{digest}.png"
+
+
+@lru_cache(maxsize=256)
+def _png_to_webp(png_path, mtime_ns):
+    """Gera (uma vez por versão do arquivo) o WebP ao lado do PNG e retorna seu caminho"""
+    webp_path = Path(png_path).with_suffix(".webp")
+    with Image.open(png_path) as img:
+        img.save(webp_path, "WEBP", quality=80, method=4)
+    return str(webp_path)
+
+
+def _chart_to_webp(path):
+    """Caminho WebP do gráfico; mantém o PNG se o Pillow não suportar WebP"""
+    if Image is None or not _pil_features.check("webp"):
+        return str(path)
+    return _png_to_webp(str(path), Path(path).stat().st_mtime_ns)
 
 # =====================================================
 # MESSAGE COMPONENTS - Diferentes tipos de mensagens
 # =====================================================
 
+# Templates HTML das bolhas (uma linha cada, formatados com str.format)
+_IMAGE_BUBBLE_TMPL = (
+    '<div style="display: flex; justify-content: {alignment}; margin: 10px 0;">'
+    '<div style="max-width: 70%;">'
+    '<img src="{url}" style="width: 100%; border-radius: 10px; '
+    'box-shadow: 0 1px 2px rgba(0,0,0,0.1);">'
+    '</div></div>'
+)
+
+_FILE_BUBBLE_TMPL = (
+    '<div style="display: flex; justify-content: {alignment}; margin: 10px 0;">'
+    '<div style="background-color: #075E54; padding: 10px 15px; border-radius: 10px; '
+    'max-width: 70%;">'
+    '<p style="margin: 0; color: #FFFFFF !important;">📎 {name}</p>'
+    '<small style="color: #FFFFFF !important;">{size} KB</small>'
+    '</div></div>'
+)
+
+# Header do chat (constante; montado uma única vez no import)
+_HEADER_HTML = """
+<div style="background: #075E54;
+            color: white;
+            padding: 15px;
+            border-radius: 10px 10px 0 0;
+            display: flex;
+            align-items: center;">
+    <div style="width: 40px;
+                height: 40px;
+                background: #25D366;
+                border-radius: 50%;
+                margin-right: 15px;
+                display: flex;
+                align-items: center;
+                justify-content: center;
+                font-size: 20px;">
+        🤖
+    </div>
+    <div>
+        <h3 style="margin: 0; color: #FFFFFF !important;">EDA Assistant</h3>
+        <small style="color: #FFFFFF !important;">Online - Análise de Dados com IA</small>
+    </div>
+</div>
+"""
+
+
 class MessageRenderer:
     @staticmethod
     def render_text(content, role):
-        """Renderiza mensagem de texto"""
-        alignment = "flex-end" if role == "user" else "flex-start"
-        bg_color = "#075E54"
-
-        st.markdown(f"""
-            <div style="display: flex; justify-content: {alignment}; margin: 10px 0;">
-                <div style="background-color: {bg_color};
-                            padding: 10px 15px;
-                            border-radius: 10px;
-                            max-width: 70%;
-                            box-shadow: 0 1px 2px rgba(0,0,0,0.1);">
-                    <p style="margin: 0; color: #FFFFFF !important;">{content}</p>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+        """Renderiza mensagem de texto com o componente nativo de chat"""
+        with st.chat_message("user" if role == "user" else "assistant"):
+            st.write(content)
 
     @staticmethod
     def render_image(image_data, role):
-        """Renderiza imagem base64"""
+        """Gera o HTML de uma imagem (bytes ou base64) servida por URL"""
         alignment = "flex-end" if role == "user" else "flex-start"
-        st.markdown(f"""
-            <div style="display: flex; justify-content: {alignment}; margin: 10px 0;">
-                <div style="max-width: 70%;">
-                    <img src="data:image/png;base64,{image_data}"
-                         style="width: 100%; border-radius: 10px;
-                                box-shadow: 0 1px 2px rgba(0,0,0,0.1);">
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+
+        # Mapeamento payload -> URL fica na sessão para evitar decode a cada rerun
+        image_urls = st.session_state.setdefault('image_urls', {})
+        url = image_urls.get(image_data)
+        if url is None:
+            raw = image_data if isinstance(image_data, bytes) else base64.b64decode(image_data)
+            url = image_urls[image_data] = ImageStore.put(raw)
+
+        return _IMAGE_BUBBLE_TMPL.format(alignment=alignment, url=url)
 
     @staticmethod
-    def render_plotly(fig_json, role):
-        """Renderiza gráfico Plotly"""
-        fig = go.Figure(json.loads(fig_json))
+    def render_image_path(path, role):
+        """Renderiza imagem a partir do arquivo, servida pelo próprio Streamlit"""
+        st.image(path)
+
+    @staticmethod
+    def render_plotly(payload, role, metadata=None):
+        """Renderiza gráfico Plotly (figura desserializada uma vez por sessão)"""
+        figures = st.session_state.setdefault('plotly_figures', {})
+        key = hash(payload)
+        fig = figures.get(key)
+        if fig is None:
+            fig_json = _blob_load(payload).decode() if (metadata or {}).get('blob') else payload
+            # from_json usa orjson quando disponível e não revalida o schema
+            fig = figures[key] = pio.from_json(fig_json, skip_invalid=True)
         st.plotly_chart(fig, use_container_width=True)
 
     @staticmethod
-    def render_dataframe(df_json, role):
-        """Renderiza DataFrame"""
-        df = pd.read_json(df_json)
+    def render_dataframe(payload, role, content_type="dataframe", metadata=None):
+        """Renderiza DataFrame (Arrow IPC no blob store, em base64 ou JSON legado)"""
+        if (metadata or {}).get('blob'):
+            df = deserialize_df(_blob_load(payload))
+        elif content_type == "dataframe_arrow":
+            df = deserialize_df(base64.b64decode(payload))
+        else:
+            df = pd.read_json(payload)
         st.dataframe(df, use_container_width=True)
 
     @staticmethod
     def render_file(file_info, role):
-        """Renderiza link de arquivo"""
+        """Gera o HTML de um link de arquivo"""
         alignment = "flex-end" if role == "user" else "flex-start"
-        st.markdown(f"""
-            <div style="display: flex; justify-content: {alignment}; margin: 10px 0;">
-                <div style="background-color: #075E54;
-                            padding: 10px 15px;
-                            border-radius: 10px;
-                            max-width: 70%;">
-                    <p style="margin: 0; color: #FFFFFF !important;">📎 {file_info['name']}</p>
-                    <small style="color: #FFFFFF !important;">{file_info['size']} KB</small>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+        return _FILE_BUBBLE_TMPL.format(
+            alignment=alignment,
+            name=html.escape(str(file_info['name'])),
+            size=html.escape(str(file_info['size']))
+        )
+
+    @staticmethod
+    def render_batch(html_parts):
+        """Emite o HTML acumulado de várias mensagens num único st.markdown"""
+        if not html_parts:
+            return
+        st.markdown("\n".join(html_parts), unsafe_allow_html=True)
 
 # =====================================================
 # CHAT INTERFACE - Interface principal
 # =====================================================
 
+# Quantidade de mensagens renderizadas por rerun (e incremento do "Carregar mais")
+RENDER_WINDOW = 30
+
+# Mensagens lidas do banco por página
+HISTORY_PAGE_SIZE = 50
+
+
+@st.cache_resource
+def _get_chat_db():
+    """Instância única de ChatHistoryDB por processo (reaproveita a conexão)"""
+    return ChatHistoryDB()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_history(session_id, before=None):
+    """Página do histórico já decodificada (memoizada por session_id/página)"""
+    return [
+        {
+            'id': msg[0],
+            'timestamp': msg[2],
+            'role': msg[3],
+            'content': msg[4],
+            'type': msg[5],
+            'metadata': _json_loads(msg[6])
+        }
+        for msg in _get_chat_db().get_session_history(session_id, HISTORY_PAGE_SIZE, before)
+    ]
+
+
 class WhatsAppStyleChat:
     def __init__(self, session_id=None):
-        self.db = ChatHistoryDB()
+        self.db = _get_chat_db()
         self.session_id = session_id or str(uuid.uuid4())
         self.renderer = MessageRenderer()
 
+        # Tabela de despacho por tipo: (retorna HTML agrupável?, renderizador)
+        renderer = self.renderer
+        render_df = lambda m: renderer.render_dataframe(m['content'], m['role'], m['type'], m['metadata'])
+        self._dispatch = {
+            'text': (False, lambda m: renderer.render_text(m['content'], m['role'])),
+            'image': (True, lambda m: renderer.render_image(m['content'], m['role'])),
+            'image_path': (False, lambda m: renderer.render_image_path(m['content'], m['role'])),
+            'plotly': (False, lambda m: renderer.render_plotly(m['content'], m['role'], m['metadata'])),
+            'dataframe': (False, render_df),
+            'dataframe_arrow': (False, render_df),
+            'file': (True, lambda m: renderer.render_file(_json_loads(m['content']), m['role'])),
+        }
+
         # Inicializar session state
         if 'messages' not in st.session_state:
             st.session_state.messages = []
             self._load_history()
 
     def _load_history(self):
-        """Carrega histórico do banco"""
-        history = self.db.get_session_history(self.session_id)
-        for msg in history:
-            st.session_state.messages.append({
-                'id': msg[0],
-                'role': msg[3],
-                'content': msg[4],
-                'type': msg[5],
-                'metadata': json.loads(msg[6])
-            })
+        """Carrega a página mais recente do histórico do banco"""
+        page = _fetch_history(self.session_id)
+        st.session_state.messages.extend(page)
+        self._set_history_cursor(page)
+
+    def load_older_history(self):
+        """Carrega a página anterior do histórico (sob demanda)"""
+        cursor = st.session_state.get('history_cursor')
+        if cursor is None:
+            return
+        page = _fetch_history(self.session_id, before=cursor)
+        st.session_state.messages[:0] = page
+        self._set_history_cursor(page)
+
+    @staticmethod
+    def _set_history_cursor(page):
+        # Página incompleta: não há mensagens mais antigas no banco
+        full_page = len(page) == HISTORY_PAGE_SIZE
+        st.session_state.history_cursor = page[0]['timestamp'] if full_page else None
 
     def render_header(self):
         """Renderiza header estilo WhatsApp"""
-        st.markdown("""
-            <div style="background: #075E54;
-                        color: white;
-                        padding: 15px;
-                        border-radius: 10px 10px 0 0;
-                        display: flex;
-                        align-items: center;">
-                <div style="width: 40px;
-                            height: 40px;
-                            background: #25D366;
-                            border-radius: 50%;
-                            margin-right: 15px;
-                            display: flex;
-                            align-items: center;
-                            justify-content: center;
-                            font-size: 20px;">
-                    🤖
-                </div>
-                <div>
-                    <h3 style="margin: 0; color: #FFFFFF !important;">EDA Assistant</h3>
-                    <small style="color: #FFFFFF !important;">Online - Análise de Dados com IA</small>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_HEADER_HTML, unsafe_allow_html=True)
 
     def render_messages(self):
-        """Renderiza todas as mensagens"""
+        """Renderiza as mensagens da janela visível (as mais recentes)"""
         chat_container = st.container()
+        messages = st.session_state.messages
+        window = st.session_state.setdefault('render_window', RENDER_WINDOW)
+        hidden = len(messages) - window
+        has_older = st.session_state.get('history_cursor') is not None
 
         with chat_container:
-            for msg in st.session_state.messages:
-                if msg['type'] == 'text':
-                    self.renderer.render_text(msg['content'], msg['role'])
-                elif msg['type'] == 'image':
-                    self.renderer.render_image(msg['content'], msg['role'])
-                elif msg['type'] == 'plotly':
-                    self.renderer.render_plotly(msg['content'], msg['role'])
-                elif msg['type'] == 'dataframe':
-                    self.renderer.render_dataframe(msg['content'], msg['role'])
-                elif msg['type'] == 'file':
-                    self.renderer.render_file(
-                        json.loads(msg['content']),
-                        msg['role']
-                    )
+            if hidden > 0 or has_older:
+                with st.expander("Mostrar mensagens anteriores"):
+                    if st.button("Carregar mais", key="load_older_messages"):
+                        if hidden < RENDER_WINDOW:
+                            self.load_older_history()
+                        st.session_state.render_window += RENDER_WINDOW
+                        _rerun_fragment()
+
+            # HTML das bolhas é acumulado e emitido em lote; componentes
+            # nativos (texto/plotly/dataframe) forçam o flush para manter a ordem
+            pending = []
+            dispatch = self._dispatch
+            for msg in messages[-window:]:
+                entry = dispatch.get(msg['type'])
+                if entry is None:
+                    continue
+                batched, handler = entry
+                if batched:
+                    pending.append(handler(msg))
+                else:
+                    self.renderer.render_batch(pending)
+                    pending = []
+                    handler(msg)
+            self.renderer.render_batch(pending)
 
     def add_message(self, role, content, content_type="text", metadata=None):
         """Adiciona nova mensagem"""
@@ -227,44 +605,51 @@ class WhatsAppStyleChat:
         }
         st.session_state.messages.append(msg)
 
-        # Salvar no banco
-        self.db.save_message(
+        # Salvar no banco (gravação em background, sem bloquear o rerun)
+        self.db.enqueue_message(
             self.session_id,
             role,
             content,
             content_type,
             metadata
         )
+        _fetch_history.clear()
 
     def add_plotly_chart(self, fig, role="assistant"):
-        """Adiciona gráfico Plotly"""
-        fig_json = fig.to_json()
-        self.add_message(role, fig_json, "plotly")
+        """Adiciona gráfico Plotly (JSON no blob store, ponteiro no histórico)"""
+        fig_json = pio.to_json(fig, validate=False)
+        self.add_message(role, _blob_store(fig_json.encode()), "plotly", metadata={"blob": True})
 
     def add_dataframe(self, df, role="assistant"):
-        """Adiciona DataFrame"""
-        df_json = df.to_json()
-        self.add_message(role, df_json, "dataframe")
+        """Adiciona DataFrame serializado em Arrow IPC (bytes no blob store)"""
+        blob_id = _blob_store(serialize_df(df))
+        # Cabeçalho de formato para permitir trocar a serialização no futuro
+        self.add_message(role, blob_id, "dataframe_arrow", metadata={"fmt": "arrow_ipc", "blob": True})
 
     def add_image_from_bytes(self, image_bytes, role="assistant"):
         """Adiciona imagem de bytes"""
-        b64 = base64.b64encode(image_bytes).decode()
+        b64 = _b64.b64encode(image_bytes).decode()
         self.add_message(role, b64, "image")
 
-    def render_input_area(self):
-        """Renderiza área de input com opções"""
-        col1, col2 = st.columns([8, 1])
-
-        with col1:
-            user_input = st.chat_input("Digite sua mensagem...")
-
-        with col2:
-            if st.button("🗑️", help="Limpar conversa"):
-                st.session_state.messages = []
-                st.rerun()
+    def add_image_path(self, path, role="assistant"):
+        """Adiciona imagem referenciada pelo caminho do arquivo"""
+        self.add_message(role, str(path), "image_path")
 
+    def render_input_area(self):
+        """Renderiza área de input"""
+        user_input = st.chat_input("Digite sua mensagem...")
         return user_input, None
 
+    def render_clear_button(self):
+        """Botão de limpar conversa na sidebar (fora do layout do chat)"""
+        if st.sidebar.button("🗑️ Limpar conversa", key="clear_chat"):
+            st.session_state.messages = []
+            # Paginação e janela de renderização voltam ao início
+            st.session_state.pop('history_cursor', None)
+            st.session_state.pop('render_window', None)
+            _fetch_history.clear()
+            st.rerun()
+
     def export_conversation(self):
         """Exporta conversa como JSON"""
         return self.db.export_conversation(self.session_id)
@@ -273,6 +658,23 @@ class WhatsAppStyleChat:
 # INTEGRAÇÃO COM EDA
 # =====================================================
 
+DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+
+
+def _scan_chart_files(charts_dir):
+    """Retorna [(Path, mtime)] dos PNGs do diretório com um único os.scandir
+
+    Sem cache: sobrescrever um gráfico existente (nome fixo) não altera o
+    mtime do diretório, então a listagem é refeita a cada consulta.
+    """
+    with os.scandir(charts_dir) as entries:
+        return [
+            (Path(entry.path), entry.stat().st_mtime)
+            for entry in entries
+            if entry.name.endswith('.png')
+        ]
+
+
 def process_eda_query(query, eda_agent=None, df=None):
     """Processa query EDA usando o agente existente"""
     if not eda_agent:
@@ -285,21 +687,20 @@ def process_eda_query(query, eda_agent=None, df=None):
         # Verificar se há gráficos gerados
         charts_dir = Path('charts')
         if charts_dir.exists():
-            chart_files = list(charts_dir.glob('*.png'))
+            chart_files = _scan_chart_files(charts_dir)
             # Pegar gráficos mais recentes (últimos 120 segundos - tempo aumentado)
-            import time
             current_time = time.time()
             recent_charts = [
-                f for f in chart_files
-                if current_time - f.stat().st_mtime < 120  # 2 minutos
+                path for path, mtime in chart_files
+                if current_time - mtime < 120  # 2 minutos
             ]
 
-            # Debug: mostrar informações dos gráficos
-            print(f"🔍 Charts encontrados: {len(chart_files)}")
-            print(f"📊 Charts recentes: {len(recent_charts)}")
-            for chart in recent_charts:
-                age = current_time - chart.stat().st_mtime
-                print(f"  - {chart.name} (idade: {age:.1f}s)")
+            if DEBUG:
+                print(f"🔍 Charts encontrados: {len(chart_files)}")
+                print(f"📊 Charts recentes: {len(recent_charts)}")
+                for path, mtime in chart_files:
+                    if current_time - mtime < 120:
+                        print(f"  - {path.name} (idade: {current_time - mtime:.1f}s)")
 
             if recent_charts:
                 print(f"✅ Enviando {len(recent_charts)} gráfico(s) para o chat")
@@ -322,33 +723,76 @@ def process_eda_query(query, eda_agent=None, df=None):
 # APLICAÇÃO PRINCIPAL - Integrada com app.py
 # =====================================================
 
+# CSS do tema WhatsApp (constante; montado uma única vez no import)
+_CSS_HTML = """
+<style>
+.stApp {
+    background-color: #075E54 !important;
+}
+.main-chat-container {
+    background-color: #075E54;
+    border-radius: 10px;
+    padding: 0;
+    margin: 10px 0;
+}
+.main-chat-container * {
+    color: #FFFFFF !important;
+}
+.main-chat-container h1, .main-chat-container h2, .main-chat-container h3,
+.main-chat-container h4, .main-chat-container h5, .main-chat-container h6 {
+    color: #FFFFFF !important;
+}
+.main-chat-container p, .main-chat-container div, .main-chat-container span {
+    color: #FFFFFF !important;
+}
+</style>
+"""
+
+
+@_fragment
+def _history_fragment(chat):
+    """Histórico isolado: "Carregar mais" reroda só este trecho"""
+    chat.render_messages()
+
+
+@_fragment
+def _input_fragment(chat):
+    """Input isolado: o app inteiro só reroda quando uma mensagem é adicionada"""
+    user_input, file_upload = chat.render_input_area()
+
+    # Processar input
+    if user_input:
+        # Adicionar mensagem do usuário
+        chat.add_message("user", user_input)
+
+        # Processar com EDA agent
+        with st.spinner("🤖 Analisando..."):
+            result = process_eda_query(
+                user_input,
+                st.session_state.eda_agent,
+                st.session_state.current_data
+            )
+
+        # Adicionar resposta
+        if result['type'] == 'text':
+            chat.add_message("assistant", result['content'])
+        elif result['type'] == 'multi':
+            for item in result['content']:
+                if item['type'] == 'text':
+                    chat.add_message("assistant", item['content'])
+                elif item['type'] == 'charts':
+                    # Gráficos são referenciados pelo caminho, sem base64
+                    for chart_path in item['content']:
+                        chat.add_image_path(_chart_to_webp(chart_path))
+
+        st.rerun()
+
+
 def render_modern_chat():
     """Função para ser chamada do app.py principal"""
 
     # CSS WhatsApp
-    st.markdown("""
-        <style>
-        .stApp {
-            background-color: #075E54 !important;
-        }
-        .main-chat-container {
-            background-color: #075E54;
-            border-radius: 10px;
-            padding: 0;
-            margin: 10px 0;
-        }
-        .main-chat-container * {
-            color: #FFFFFF !important;
-        }
-        .main-chat-container h1, .main-chat-container h2, .main-chat-container h3,
-        .main-chat-container h4, .main-chat-container h5, .main-chat-container h6 {
-            color: #FFFFFF !important;
-        }
-        .main-chat-container p, .main-chat-container div, .main-chat-container span {
-            color: #FFFFFF !important;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_CSS_HTML, unsafe_allow_html=True)
 
     # Verificar se tem agente e dados carregados
     if not st.session_state.get('eda_agent'):
@@ -368,43 +812,15 @@ def render_modern_chat():
 
         # Header
         chat.render_header()
+        chat.render_clear_button()
 
         # Mensagens
-        chat.render_messages()
+        _history_fragment(chat)
 
         st.markdown('</div>', unsafe_allow_html=True)
 
     # Input
-    user_input, file_upload = chat.render_input_area()
-
-    # Processar input
-    if user_input:
-        # Adicionar mensagem do usuário
-        chat.add_message("user", user_input)
-
-        # Processar com EDA agent
-        with st.spinner("🤖 Analisando..."):
-            result = process_eda_query(
-                user_input,
-                st.session_state.eda_agent,
-                st.session_state.current_data
-            )
-
-        # Adicionar resposta
-        if result['type'] == 'text':
-            chat.add_message("assistant", result['content'])
-        elif result['type'] == 'multi':
-            for item in result['content']:
-                if item['type'] == 'text':
-                    chat.add_message("assistant", item['content'])
-                elif item['type'] == 'charts':
-                    # Converter gráficos para base64
-                    for chart_path in item['content']:
-                        with open(chart_path, 'rb') as f:
-                            chart_bytes = f.read()
-                        chat.add_image_from_bytes(chart_bytes)
-
-        st.rerun()
+    _input_fragment(chat)
 
     # Upload removido - dados carregados via sidebar principal
 
@@ -6,6 +6,7 @@ Usage:
     python run_streamlit.py
 """
 
+import os
 import subprocess
 import sys
 from pathlib import Path
@@ -18,8 +19,7 @@ print(f"[INFO] App path: {app_path}")
 print(f"[INFO] Open browser at: http://localhost:8501")
 print(f"\n" + "=" * 80 + "\n")
 
-# Run streamlit
-subprocess.run([
+streamlit_cmd = [
     sys.executable,
     "-m",
     "streamlit",
@@ -28,4 +28,12 @@ subprocess.run([
     "--server.port=8501",
     "--server.address=localhost",
     "--browser.gatherUsageStats=false"
-])
+]
+
+# Run streamlit: em Unix o processo atual é substituído (sem um Python extra
+# só esperando); no Windows execv não preserva o console, então usa subprocess
+if os.name == "posix":
+    sys.stdout.flush()
+    os.execvp(sys.executable, streamlit_cmd)
+else:
+    subprocess.run(streamlit_cmd)
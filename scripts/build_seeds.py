@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Build do Snapshot de Sementes - MVP Sucroalcooleiro
+
+Executa a população das sementes uma única vez contra um data/seeds.db novo. O
+populate_db.py passa a carregar as sementes desse arquivo via ATTACH +
+INSERT ... SELECT, sem montar linhas em Python.
+
+Usage:
+    python scripts/build_seeds.py
+"""
+
+from pathlib import Path
+
+from populate_db import DatabasePopulator
+
+
+def main():
+    """Main function"""
+    project_root = Path(__file__).parent.parent
+    seeds_path = project_root / "data" / "seeds.db"
+    schema_path = project_root / "src" / "database" / "schema.sql"
+
+    seeds_path.parent.mkdir(parents=True, exist_ok=True)
+    seeds_path.unlink(missing_ok=True)
+
+    populator = DatabasePopulator(str(seeds_path))
+    try:
+        populator.connect()
+        populator.create_schema_tables_only(str(schema_path))
+
+        populator.begin()
+        populator.populate_all()
+        # Hash das fontes: populate_db.py ignora o snapshot se elas mudarem
+        populator.store_sources_hash()
+        populator.finalize()
+
+        # Arquivo único (sem -wal/-shm) para distribuição
+        populator.conn.execute("PRAGMA journal_mode=DELETE")
+        print(f"\n[OK] Snapshot gerado: {seeds_path}")
+
+    except Exception:
+        populator.rollback()
+        raise
+
+    finally:
+        populator.close()
+
+
+if __name__ == "__main__":
+    main()
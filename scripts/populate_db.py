@@ -13,10 +13,677 @@ Popula rules.db com:
 Versão: 1.0.0
 """
 
+import os
+import csv
+import hashlib
 import sqlite3
+import sys
 import json
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
 from datetime import date
+from typing import Callable, Iterable, NamedTuple
+
+# JSON dos campos de lista/objeto das sementes, serializado uma única vez no import
+
+# Operações válidas por CST
+_OPS_VENDA_COMPRA = json.dumps(['VENDA', 'COMPRA'])
+_OPS_VENDA = json.dumps(['VENDA'])
+_OPS_VENDA_EXPORTACAO = json.dumps(['VENDA', 'EXPORTACAO'])
+_OPS_VENDA_COMPRA_EXPORTACAO = json.dumps(['VENDA', 'COMPRA', 'EXPORTACAO'])
+_OPS_COMPRA = json.dumps(['COMPRA'])
+
+# Artigos relevantes das referências legais
+_ARTS_LEI_10637 = json.dumps({
+    'Art. 2º': 'Alíquota de 1,65%',
+    'Art. 3º': 'Direito ao crédito',
+    'Art. 5º': 'Isenções e alíquota zero'
+})
+_ARTS_LEI_10833 = json.dumps({
+    'Art. 2º': 'Alíquota de 7,6%',
+    'Art. 3º': 'Direito ao crédito',
+    'Art. 6º': 'Isenções e alíquota zero'
+})
+_ARTS_IN_2121 = json.dumps({
+    'Anexo I': 'Tabela NCM completa',
+    'Capítulo 17': 'Açúcares e produtos de confeitaria'
+})
+_ARTS_TIPI_17 = json.dumps({
+    '1701': 'Açúcares de cana ou de beterraba - IPI: 0% (isento)',
+    '1702': 'Outros açúcares - IPI variável'
+})
+_ARTS_SINIEF_0705 = json.dumps({
+    'Anexo I': 'Tabela CFOP completa'
+})
+
+# Tributos afetados
+_TAXES_PIS = json.dumps(['PIS'])
+_TAXES_COFINS = json.dumps(['COFINS'])
+_TAXES_ICMS_IPI_II = json.dumps(['ICMS', 'IPI', 'II'])
+_TAXES_IPI = json.dumps(['IPI'])
+_TAXES_ICMS = json.dumps(['ICMS'])
+
+# UFs aplicáveis
+_STATES_ALL = json.dumps(['ALL'])
+
+
+# =====================================================
+# Sementes (registros sem a coluna version, preenchida na carga)
+# =====================================================
+
+CST_SEEDS = [
+    {
+        'cst': '01',
+        'description': 'Operação Tributável com Alíquota Básica',
+        'situation_type': 'TRIBUTADA',
+        'pis_rate_standard': 1.65,
+        'cofins_rate_standard': 7.60,
+        'pis_rate_cumulative': 0.65,
+        'cofins_rate_cumulative': 3.00,
+        'requires_base_calculation': 1,
+        'allows_credit': 1,
+        'legal_reference': 'Lei 10.637/2002 e Lei 10.833/2003',
+        'legal_article': 'Art. 2º - Alíquotas de 1,65% (PIS) e 7,6% (COFINS)',
+        'valid_for_operations': _OPS_VENDA_COMPRA,
+        'notes': 'CST mais comum para operações tributadas no regime não-cumulativo'
+    },
+    {
+        'cst': '04',
+        'description': 'Operação Tributável Monofásica - Revenda a Alíquota Zero',
+        'situation_type': 'TRIBUTADA_MONOFASICA',
+        'pis_rate_standard': 0.00,
+        'cofins_rate_standard': 0.00,
+        'pis_rate_cumulative': 0.00,
+        'cofins_rate_cumulative': 0.00,
+        'requires_base_calculation': 0,
+        'allows_credit': 0,
+        'legal_reference': 'Lei 10.637/2002 e Lei 10.833/2003',
+        'legal_article': 'Art. 3º - Tributação monofásica',
+        'valid_for_operations': _OPS_VENDA,
+        'notes': 'Para produtos com tributação concentrada (combustíveis, bebidas, etc)'
+    },
+    {
+        'cst': '06',
+        'description': 'Operação Tributável a Alíquota Zero',
+        'situation_type': 'ALIQUOTA_ZERO',
+        'pis_rate_standard': 0.00,
+        'cofins_rate_standard': 0.00,
+        'pis_rate_cumulative': 0.00,
+        'cofins_rate_cumulative': 0.00,
+        'requires_base_calculation': 1,
+        'allows_credit': 1,
+        'legal_reference': 'Lei 10.637/2002 e Lei 10.833/2003',
+        'legal_article': 'Art. 5º - Alíquota zero para exportações',
+        'valid_for_operations': _OPS_VENDA_EXPORTACAO,
+        'notes': 'Usado principalmente para exportações'
+    },
+    {
+        'cst': '07',
+        'description': 'Operação Isenta da Contribuição',
+        'situation_type': 'ISENTA',
+        'pis_rate_standard': 0.00,
+        'cofins_rate_standard': 0.00,
+        'pis_rate_cumulative': 0.00,
+        'cofins_rate_cumulative': 0.00,
+        'requires_base_calculation': 0,
+        'allows_credit': 0,
+        'legal_reference': 'Lei 10.637/2002 e Lei 10.833/2003',
+        'legal_article': 'Art. 5º e 6º - Isenções específicas',
+        'valid_for_operations': _OPS_VENDA_COMPRA,
+        'notes': 'Operações com isenção legal'
+    },
+    {
+        'cst': '08',
+        'description': 'Operação sem Incidência da Contribuição',
+        'situation_type': 'NAO_INCIDENCIA',
+        'pis_rate_standard': 0.00,
+        'cofins_rate_standard': 0.00,
+        'pis_rate_cumulative': 0.00,
+        'cofins_rate_cumulative': 0.00,
+        'requires_base_calculation': 0,
+        'allows_credit': 0,
+        'legal_reference': 'Lei 10.637/2002 e Lei 10.833/2003',
+        'legal_article': 'Art. 4º - Operações sem incidência',
+        'valid_for_operations': _OPS_VENDA_COMPRA_EXPORTACAO,
+        'notes': 'Operações fora do campo de incidência (ex: exportação)'
+    },
+    {
+        'cst': '49',
+        'description': 'Outras Operações de Saída',
+        'situation_type': 'OUTRAS',
+        'pis_rate_standard': None,
+        'cofins_rate_standard': None,
+        'pis_rate_cumulative': None,
+        'cofins_rate_cumulative': None,
+        'requires_base_calculation': 0,
+        'allows_credit': 0,
+        'legal_reference': 'Lei 10.637/2002 e Lei 10.833/2003',
+        'legal_article': None,
+        'valid_for_operations': _OPS_VENDA,
+        'notes': 'Outras situações não especificadas'
+    },
+    {
+        'cst': '50',
+        'description': 'Operação com Direito a Crédito - Vinculada Exclusivamente a Receita Tributada',
+        'situation_type': 'TRIBUTADA',
+        'pis_rate_standard': 1.65,
+        'cofins_rate_standard': 7.60,
+        'pis_rate_cumulative': 0.00,
+        'cofins_rate_cumulative': 0.00,
+        'requires_base_calculation': 1,
+        'allows_credit': 1,
+        'legal_reference': 'Lei 10.637/2002 e Lei 10.833/2003',
+        'legal_article': 'Art. 3º - Créditos do regime não-cumulativo',
+        'valid_for_operations': _OPS_COMPRA,
+        'notes': 'CST de entrada - direito a crédito integral'
+    },
+]
+
+CFOP_SEEDS = [
+    # Saídas internas (5xxx)
+    {
+        'cfop': '5101',
+        'description': 'Venda de produção do estabelecimento',
+        'operation_type': 'SAIDA',
+        'operation_scope': 'INTERNO',
+        'nature': 'VENDA',
+        'requires_icms': 1,
+        'requires_ipi': 0,
+        'exempt_pis_cofins': 0,
+        'common_for_sector': 'sucroalcooleiro',
+        'legal_reference': 'Tabela CFOP - Ajuste SINIEF 07/05',
+        'notes': 'CFOP mais comum para venda interna de açúcar produzido'
+    },
+    {
+        'cfop': '5102',
+        'description': 'Venda de mercadoria adquirida ou recebida de terceiros',
+        'operation_type': 'SAIDA',
+        'operation_scope': 'INTERNO',
+        'nature': 'VENDA',
+        'requires_icms': 1,
+        'requires_ipi': 0,
+        'exempt_pis_cofins': 0,
+        'common_for_sector': 'geral',
+        'legal_reference': 'Tabela CFOP - Ajuste SINIEF 07/05',
+        'notes': 'Venda interna de mercadoria adquirida (revenda)'
+    },
+
+    # Saídas interestaduais (6xxx)
+    {
+        'cfop': '6101',
+        'description': 'Venda de produção do estabelecimento',
+        'operation_type': 'SAIDA',
+        'operation_scope': 'INTERESTADUAL',
+        'nature': 'VENDA',
+        'requires_icms': 1,
+        'requires_ipi': 0,
+        'exempt_pis_cofins': 0,
+        'common_for_sector': 'sucroalcooleiro',
+        'legal_reference': 'Tabela CFOP - Ajuste SINIEF 07/05',
+        'notes': 'CFOP mais comum para venda interestadual de açúcar produzido'
+    },
+    {
+        'cfop': '6102',
+        'description': 'Venda de mercadoria adquirida ou recebida de terceiros',
+        'operation_type': 'SAIDA',
+        'operation_scope': 'INTERESTADUAL',
+        'nature': 'VENDA',
+        'requires_icms': 1,
+        'requires_ipi': 0,
+        'exempt_pis_cofins': 0,
+        'common_for_sector': 'geral',
+        'legal_reference': 'Tabela CFOP - Ajuste SINIEF 07/05',
+        'notes': 'Venda interestadual de mercadoria adquirida (revenda)'
+    },
+
+    # Exportações (7xxx)
+    {
+        'cfop': '7101',
+        'description': 'Venda de produção do estabelecimento',
+        'operation_type': 'SAIDA',
+        'operation_scope': 'EXTERIOR',
+        'nature': 'EXPORTACAO',
+        'requires_icms': 0,
+        'requires_ipi': 0,
+        'exempt_pis_cofins': 1,
+        'common_for_sector': 'sucroalcooleiro',
+        'legal_reference': 'Tabela CFOP - Ajuste SINIEF 07/05',
+        'notes': 'Exportação - isento de ICMS, IPI, PIS e COFINS'
+    },
+
+    # Entradas internas (1xxx)
+    {
+        'cfop': '1101',
+        'description': 'Compra para industrialização ou produção rural',
+        'operation_type': 'ENTRADA',
+        'operation_scope': 'INTERNO',
+        'nature': 'COMPRA',
+        'requires_icms': 1,
+        'requires_ipi': 0,
+        'exempt_pis_cofins': 0,
+        'common_for_sector': 'geral',
+        'legal_reference': 'Tabela CFOP - Ajuste SINIEF 07/05',
+        'notes': 'Compra interna para industrialização'
+    },
+
+    # Entradas interestaduais (2xxx)
+    {
+        'cfop': '2101',
+        'description': 'Compra para industrialização ou produção rural',
+        'operation_type': 'ENTRADA',
+        'operation_scope': 'INTERESTADUAL',
+        'nature': 'COMPRA',
+        'requires_icms': 1,
+        'requires_ipi': 0,
+        'exempt_pis_cofins': 0,
+        'common_for_sector': 'geral',
+        'legal_reference': 'Tabela CFOP - Ajuste SINIEF 07/05',
+        'notes': 'Compra interestadual para industrialização'
+    },
+]
+
+STATE_SEEDS = [
+    # São Paulo
+    {
+        'state': 'SP',
+        'override_type': 'ICMS',
+        'ncm': '17019900',
+        'cfop': None,
+        'sector': 'sucroalcooleiro',
+        'rule_name': 'ICMS Padrão Açúcar SP',
+        'rule_description': 'Alíquota padrão de ICMS para açúcar em operações internas em SP',
+        'icms_rate': 18.00,
+        'icms_reduction_rate': None,
+        'is_st': 0,
+        'st_mva': None,
+        'legal_reference': 'RICMS/SP Decreto 45.490/2000',
+        'legal_article': 'Art. 52 - Alíquota interna de 18%',
+        'decree_number': 'Decreto 45.490/2000',
+        'valid_from': '2023-01-01',
+        'valid_until': None,
+        'severity': 'WARNING',
+        'notes': 'MVP: validação mínima - apenas warning se divergir'
+    },
+    {
+        'state': 'SP',
+        'override_type': 'REDUCAO_BC',
+        'ncm': None,
+        'cfop': '5101',
+        'sector': 'sucroalcooleiro',
+        'rule_name': 'Redução BC ICMS - Produtos Primários',
+        'rule_description': 'Alguns produtos primários podem ter redução de base de cálculo em SP',
+        'icms_rate': 18.00,
+        'icms_reduction_rate': 0.00,  # MVP: sem redução por padrão
+        'is_st': 0,
+        'st_mva': None,
+        'legal_reference': 'RICMS/SP Decreto 45.490/2000',
+        'legal_article': 'Art. 53 - Verificar convênios específicos',
+        'decree_number': 'Decreto 45.490/2000',
+        'valid_from': '2023-01-01',
+        'valid_until': None,
+        'severity': 'INFO',
+        'notes': 'MVP: informativo - verificar legislação específica se aplicável'
+    },
+
+    # Pernambuco
+    {
+        'state': 'PE',
+        'override_type': 'ICMS',
+        'ncm': '17019900',
+        'cfop': None,
+        'sector': 'sucroalcooleiro',
+        'rule_name': 'ICMS Padrão Açúcar PE',
+        'rule_description': 'Alíquota padrão de ICMS para açúcar em operações internas em PE',
+        'icms_rate': 18.00,
+        'icms_reduction_rate': None,
+        'is_st': 0,
+        'st_mva': None,
+        'legal_reference': 'RICMS/PE Decreto 14.876/1991',
+        'legal_article': 'Art. 18 - Alíquota interna de 18%',
+        'decree_number': 'Decreto 14.876/1991',
+        'valid_from': '2023-01-01',
+        'valid_until': None,
+        'severity': 'WARNING',
+        'notes': 'MVP: validação mínima - apenas warning se divergir'
+    },
+]
+
+LEGAL_SEEDS = [
+    {
+        'code': 'LEI_10637',
+        'ref_type': 'LEI',
+        'number': '10.637',
+        'year': 2002,
+        'title': 'Lei do PIS não-cumulativo',
+        'summary': 'Dispõe sobre a não-cumulatividade na cobrança da contribuição para o PIS/PASEP',
+        'issuing_body': 'RECEITA_FEDERAL',
+        'scope': 'FEDERAL',
+        'applicable_states': None,
+        'full_text': None,
+        'url': 'http://www.planalto.gov.br/ccivil_03/leis/2002/l10637.htm',
+        'relevant_articles': _ARTS_LEI_10637,
+        'affects_taxes': _TAXES_PIS,
+        'published_date': '2002-12-30',
+        'effective_date': '2002-12-01',
+        'revoked_date': None,
+        'notes': 'Lei fundamental do PIS não-cumulativo'
+    },
+    {
+        'code': 'LEI_10833',
+        'ref_type': 'LEI',
+        'number': '10.833',
+        'year': 2003,
+        'title': 'Lei da COFINS não-cumulativa',
+        'summary': 'Institui a Contribuição para o Financiamento da Seguridade Social não-cumulativa',
+        'issuing_body': 'RECEITA_FEDERAL',
+        'scope': 'FEDERAL',
+        'applicable_states': None,
+        'full_text': None,
+        'url': 'http://www.planalto.gov.br/ccivil_03/leis/2003/l10.833.htm',
+        'relevant_articles': _ARTS_LEI_10833,
+        'affects_taxes': _TAXES_COFINS,
+        'published_date': '2003-12-29',
+        'effective_date': '2004-02-01',
+        'revoked_date': None,
+        'notes': 'Lei fundamental da COFINS não-cumulativa'
+    },
+    {
+        'code': 'IN_2121',
+        'ref_type': 'INSTRUCAO_NORMATIVA',
+        'number': '2.121',
+        'year': 2022,
+        'title': 'Instrução Normativa RFB nº 2.121/2022',
+        'summary': 'Dispõe sobre a Nomenclatura Comum do Mercosul (NCM)',
+        'issuing_body': 'RECEITA_FEDERAL',
+        'scope': 'FEDERAL',
+        'applicable_states': None,
+        'full_text': None,
+        'url': 'https://www.gov.br/receitafederal/pt-br/assuntos/aduana-e-comercio-exterior/manuais/importacao/topicos-1/classificacao-fiscal/nomenclatura-comum-do-mercosul-ncm',
+        'relevant_articles': _ARTS_IN_2121,
+        'affects_taxes': _TAXES_ICMS_IPI_II,
+        'published_date': '2022-12-23',
+        'effective_date': '2023-01-01',
+        'revoked_date': None,
+        'notes': 'Tabela NCM vigente - atualizada anualmente'
+    },
+    {
+        'code': 'TIPI_17',
+        'ref_type': 'TABELA',
+        'number': 'Capítulo 17',
+        'year': 2023,
+        'title': 'TIPI - Tabela de Incidência do Imposto sobre Produtos Industrializados - Capítulo 17',
+        'summary': 'Açúcares e produtos de confeitaria - NCMs e alíquotas de IPI',
+        'issuing_body': 'RECEITA_FEDERAL',
+        'scope': 'FEDERAL',
+        'applicable_states': None,
+        'full_text': None,
+        'url': 'https://www.gov.br/receitafederal/pt-br/assuntos/aduana-e-comercio-exterior/manuais/importacao/topicos-1/classificacao-fiscal/tipi',
+        'relevant_articles': _ARTS_TIPI_17,
+        'affects_taxes': _TAXES_IPI,
+        'published_date': '2023-01-01',
+        'effective_date': '2023-01-01',
+        'revoked_date': None,
+        'notes': 'Açúcar do capítulo 17 geralmente isento de IPI'
+    },
+    {
+        'code': 'SINIEF_0705',
+        'ref_type': 'AJUSTE',
+        'number': '07/05',
+        'year': 2005,
+        'title': 'Ajuste SINIEF 07/05 - Tabela CFOP',
+        'summary': 'Código Fiscal de Operações e Prestações - Tabela completa',
+        'issuing_body': 'CONFAZ',
+        'scope': 'FEDERAL',
+        'applicable_states': _STATES_ALL,
+        'full_text': None,
+        'url': 'https://www.confaz.fazenda.gov.br/legislacao/ajustes/2005/ajuste-sinief-07-05',
+        'relevant_articles': _ARTS_SINIEF_0705,
+        'affects_taxes': _TAXES_ICMS,
+        'published_date': '2005-07-30',
+        'effective_date': '2005-10-01',
+        'revoked_date': None,
+        'notes': 'Tabela CFOP oficial - base para validação'
+    },
+]
+
+
+# Sementes mantidas em CSV (crescem até a tabela TIPI completa)
+NCM_SEED_CSV = Path(__file__).resolve().parent.parent / 'data' / 'ncm_rules.csv'
+
+# Ordem das colunas de cada tabela (parâmetros posicionais no INSERT)
+COLUMNS_NCM = (
+    'ncm', 'description', 'category', 'ipi_rate', 'is_ipi_exempt',
+    'pis_cofins_regime', 'keywords', 'valid_from', 'valid_until',
+    'version', 'sector', 'product_type', 'notes',
+)
+COLUMNS_CST = (
+    'cst', 'description', 'situation_type',
+    'pis_rate_standard', 'cofins_rate_standard',
+    'pis_rate_cumulative', 'cofins_rate_cumulative',
+    'requires_base_calculation', 'allows_credit',
+    'legal_reference', 'legal_article', 'valid_for_operations',
+    'version', 'notes',
+)
+COLUMNS_CFOP = (
+    'cfop', 'description', 'operation_type', 'operation_scope',
+    'nature', 'requires_icms', 'requires_ipi', 'exempt_pis_cofins',
+    'common_for_sector', 'legal_reference', 'version', 'notes',
+)
+COLUMNS_STATE = (
+    'state', 'override_type', 'ncm', 'cfop', 'sector',
+    'rule_name', 'rule_description', 'icms_rate', 'icms_reduction_rate',
+    'is_st', 'st_mva', 'legal_reference', 'legal_article', 'decree_number',
+    'valid_from', 'valid_until', 'version', 'severity', 'notes',
+)
+COLUMNS_LEGAL = (
+    'code', 'ref_type', 'number', 'year', 'title', 'summary',
+    'issuing_body', 'scope', 'applicable_states', 'full_text', 'url',
+    'relevant_articles', 'affects_taxes', 'published_date',
+    'effective_date', 'revoked_date', 'version', 'notes',
+)
+
+
+# Chave natural (UNIQUE) de cada tabela; state_overrides não tem
+_UNIQUE_KEYS = {
+    'ncm_rules': 'ncm',
+    'pis_cofins_rules': 'cst',
+    'cfop_rules': 'cfop',
+    'legal_refs': 'code',
+}
+
+# Limite de parâmetros por statement em builds antigos do SQLite
+_MAX_SQL_PARAMS = 999
+
+
+def _upsert_clause(table, columns):
+    """ON CONFLICT da chave natural: UPDATE apenas quando algum valor mudou"""
+    key = _UNIQUE_KEYS.get(table)
+    if key is None:
+        return ""
+    targets = [col for col in columns if col != key]
+    new_values = ', '.join(f"excluded.{col}" for col in targets)
+    return (
+        f" ON CONFLICT({key}) DO UPDATE SET "
+        + ', '.join(f"{col} = excluded.{col}" for col in targets)
+        + f" WHERE ({', '.join(targets)}) IS NOT ({new_values})"
+    )
+
+
+@lru_cache(maxsize=32)
+def _insert_sql(table, columns, n_rows=1):
+    """INSERT com `n_rows` grupos VALUES de parâmetros posicionais
+
+    Memoizado: com lotes de tamanho fixo há no máximo duas variantes por
+    tabela (lote cheio + resto). Em tabelas com chave natural, re-execuções
+    com as mesmas sementes não reescrevem linhas.
+    """
+    group = f"({', '.join('?' * len(columns))})"
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES {', '.join([group] * n_rows)}"
+        + _upsert_clause(table, columns)
+    )
+
+
+def _copy_sql(table, columns, schema='src'):
+    """INSERT … SELECT da tabela de sementes de um banco anexado"""
+    # WHERE true: exigido pelo SQLite para separar o SELECT do ON CONFLICT
+    return (
+        f"INSERT INTO main.{table} ({', '.join(columns)}) "
+        f"SELECT {', '.join(columns)} FROM {schema}.{table} WHERE true"
+        + _upsert_clause(table, columns)
+    )
+
+
+def _insert_rows(conn, table, columns, rows):
+    """Insere as linhas com INSERTs multi-VALUES (um statement por lote)
+
+    `rows` pode ser qualquer iterável: os lotes são consumidos sob demanda.
+    """
+    batch_size = max(1, _MAX_SQL_PARAMS // len(columns))
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        conn.execute(
+            _insert_sql(table, columns, len(batch)),
+            list(chain.from_iterable(batch))
+        )
+
+
+# Contagens conferidas em verify_population (nomes fixos, seguros para interpolar)
+_COUNT_TABLES = ('ncm_rules', 'pis_cofins_rules', 'cfop_rules', 'state_overrides', 'legal_refs')
+_COUNT_VIEWS = ('v_sugar_ncms', 'v_valid_csts', 'v_sugar_cfops', 'v_state_rules_active')
+_COUNTS_SQL = "SELECT " + ", ".join(
+    f"(SELECT COUNT(*) FROM {name})" for name in _COUNT_TABLES + _COUNT_VIEWS
+)
+
+
+def _split_schema(schema_sql):
+    """Separa o schema em (script sem índices, tupla de CREATE INDEX)
+
+    Cada CREATE INDEX do schema.sql ocupa uma única linha.
+    """
+    script_lines = []
+    index_statements = []
+    for line in schema_sql.splitlines():
+        if line.lstrip().upper().startswith('CREATE INDEX'):
+            index_statements.append(line.strip())
+        else:
+            script_lines.append(line)
+    return '\n'.join(script_lines), tuple(index_statements)
+
+
+def _load_schema(schema_path):
+    """Schema lido e separado uma única vez por versão (mtime) do arquivo"""
+    return _load_schema_cached(str(schema_path), os.stat(schema_path).st_mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _load_schema_cached(schema_path, mtime_ns):
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        return _split_schema(f.read())
+
+
+def _read_seed_csv(path, columns, **fixed):
+    """Gera as linhas de um CSV de sementes como tuplas na ordem de `columns`
+
+    Células vazias viram NULL; colunas ausentes do CSV vêm de `fixed`.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        index = [header.index(col) if col in header else None for col in columns]
+        fixed_values = [fixed.get(col) for col in columns]
+        for row in reader:
+            yield tuple(
+                (row[i] or None) if i is not None else value
+                for i, value in zip(index, fixed_values)
+            )
+
+
+def _seed_hash(rows):
+    """SHA-256 do conteúdo das sementes (linhas já na ordem das colunas)"""
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(json.dumps(row).encode())
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def _as_rows(records, columns, **fixed):
+    """Gera os registros (dicts) como tuplas na ordem de `columns`
+
+    Colunas ausentes do registro vêm de `fixed` (ex.: version).
+    """
+    return (
+        tuple(record[col] if col in record else fixed[col] for col in columns)
+        for record in records
+    )
+
+
+class SeedTable(NamedTuple):
+    """Entrada do registro de sementes: tabela, colunas e origem das linhas"""
+    table: str
+    columns: tuple
+    load: Callable[[str], Iterable[tuple]]  # version -> linhas
+    title: str
+    label: str
+
+
+# Registro declarativo das tabelas de sementes, na ordem de população
+SEED_TABLES = (
+    SeedTable(
+        'ncm_rules', COLUMNS_NCM,
+        lambda version: _read_seed_csv(NCM_SEED_CSV, COLUMNS_NCM, version=version),
+        'NCM Rules', 'NCMs inseridos'
+    ),
+    SeedTable(
+        'pis_cofins_rules', COLUMNS_CST,
+        lambda version: _as_rows(CST_SEEDS, COLUMNS_CST, version=version),
+        'PIS/COFINS Rules', 'CSTs PIS/COFINS inseridos'
+    ),
+    SeedTable(
+        'cfop_rules', COLUMNS_CFOP,
+        lambda version: _as_rows(CFOP_SEEDS, COLUMNS_CFOP, version=version),
+        'CFOP Rules', 'CFOPs inseridos'
+    ),
+    SeedTable(
+        'state_overrides', COLUMNS_STATE,
+        lambda version: _as_rows(STATE_SEEDS, COLUMNS_STATE, version=version),
+        'State Overrides (SP + PE)', 'regras estaduais (SP + PE) inseridas'
+    ),
+    SeedTable(
+        'legal_refs', COLUMNS_LEGAL,
+        lambda version: _as_rows(LEGAL_SEEDS, COLUMNS_LEGAL, version=version),
+        'Legal References', 'referências legais inseridas'
+    ),
+)
+_SEEDS_BY_TABLE = {seed.table: seed for seed in SEED_TABLES}
+
+# Chave em db_metadata do seeds.db com o hash das fontes usadas no build
+SOURCES_HASH_KEY = 'seed_sources_hash'
+
+
+def _seed_sources_hash(version):
+    """SHA-256 das fontes atuais de todas as sementes (CSV + listas inline)"""
+    return _seed_hash(
+        (seed.table, _seed_hash(seed.load(version))) for seed in SEED_TABLES
+    )
+
+
+def _snapshot_sources_hash(seeds_path):
+    """Hash das fontes gravado no seeds.db (None se ausente ou ilegível)"""
+    try:
+        conn = sqlite3.connect(f"{Path(seeds_path).resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            row = conn.execute(
+                "SELECT value FROM db_metadata WHERE key = ?", (SOURCES_HASH_KEY,)
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
 
 
 class DatabasePopulator:
@@ -29,625 +696,168 @@ class DatabasePopulator:
 
     def connect(self):
         """Conectar ao database"""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
+        # Autocommit: as transações são abertas/fechadas explicitamente
+        self.conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256
+        )
+        # Carga em lote: WAL, menos fsync, temporários em memória, cache de 64 MB
+        # e mmap de 256 MB; EXCLUSIVE é seguro pois a população tem um único escritor
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-65536;
+            PRAGMA mmap_size=268435456;
+            PRAGMA locking_mode=EXCLUSIVE;
+        """)
         print(f"[OK] Conectado a: {self.db_path}")
 
     def create_schema(self, schema_path: str):
-        """Criar schema do database"""
-        with open(schema_path, 'r', encoding='utf-8') as f:
-            schema_sql = f.read()
+        """Criar schema do database (tabelas, views, triggers e índices)"""
+        self.create_schema_tables_only(schema_path)
+        self.create_indexes(schema_path)
+
+    def create_schema_tables_only(self, schema_path: str):
+        """Criar schema sem os índices secundários (criados após a carga)"""
+        tables_sql, _ = _load_schema(schema_path)
 
-        # Executar script SQL
-        self.conn.executescript(schema_sql)
-        self.conn.commit()
+        # Executar script SQL (conexão em autocommit: sem commit implícito)
+        self.conn.executescript(tables_sql)
         print("[OK] Schema criado com sucesso")
 
-    def populate_ncm_rules(self):
+    def create_indexes(self, schema_path: str):
+        """Criar os índices secundários (um B-tree por índice, já com os dados)"""
+        _, index_statements = _load_schema(schema_path)
+
+        # execute() em vez de executescript() para não encerrar a transação aberta
+        for statement in index_statements:
+            self.conn.execute(statement)
+        print(f"[OK] {len(index_statements)} índices criados")
+
+    def begin(self):
+        """Abrir a transação única da população (já com o lock de escrita)"""
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def finalize(self):
+        """Gravar a população inteira de uma vez (um único COMMIT)"""
+        self.conn.execute("COMMIT")
+        print("\n[OK] Transação gravada")
+
+    def vacuum_into(self, target_path):
+        """Gravar o database construído em memória num arquivo novo, de uma só vez"""
+        self.conn.execute("VACUUM INTO ?", (str(target_path),))
+        print(f"[OK] Database gravado em: {target_path}")
+
+    def rollback(self):
+        """Descartar a população em andamento"""
+        if self.conn and self.conn.in_transaction:
+            self.conn.execute("ROLLBACK")
+
+    def _populate_table(self, conn, table, columns, rows):
+        """Inserir as sementes da tabela, a menos que o hash delas não tenha mudado
+
+        O hash fica em db_metadata (seed_hash_<tabela>), gravado na mesma transação.
+        Retorna o número de linhas inseridas, ou None se a tabela foi pulada.
+        """
+        # Única materialização das linhas: o hash precisa delas antes do INSERT
+        rows = list(rows)
+        metadata_key = f"seed_hash_{table}"
+        seed_hash = _seed_hash(rows)
+        stored = conn.execute(
+            "SELECT value FROM db_metadata WHERE key = ?", (metadata_key,)
+        ).fetchone()
+        if stored is not None and stored[0] == seed_hash:
+            print(f"[SKIP] {table}: sementes inalteradas")
+            return None
+
+        _insert_rows(conn, table, columns, rows)
+        conn.execute("""
+            INSERT INTO db_metadata (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                value = excluded.value, updated_at = CURRENT_TIMESTAMP
+        """, (metadata_key, seed_hash))
+        return len(rows)
+
+    def attach_snapshot(self, seeds_path):
+        """Anexar o seeds.db pré-construído (fora de transação, exigência do ATTACH)"""
+        self.conn.execute("ATTACH DATABASE ? AS src", (str(seeds_path),))
+        print(f"[OK] Snapshot de sementes anexado: {seeds_path}")
+
+    def snapshot_is_current(self, seeds_path):
+        """O seeds.db foi gerado a partir das fontes de sementes atuais?"""
+        return _snapshot_sources_hash(seeds_path) == _seed_sources_hash(self.version)
+
+    def store_sources_hash(self):
+        """Gravar em db_metadata o hash das fontes (usado pelo build_seeds.py)"""
+        self.conn.execute("""
+            INSERT INTO db_metadata (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                value = excluded.value, updated_at = CURRENT_TIMESTAMP
+        """, (SOURCES_HASH_KEY, _seed_sources_hash(self.version)))
+
+    def detach_snapshot(self):
+        """Desanexar o seeds.db"""
+        self.conn.execute("DETACH DATABASE src")
+
+    def populate_from_snapshot(self, conn=None):
+        """Copiar as sementes do snapshot anexado, tabela a tabela, dentro do SQLite"""
+        conn = conn or self.conn
+        print("\n[*] Populando a partir do snapshot de sementes...")
+        for seed in SEED_TABLES:
+            table = seed.table
+            metadata_key = f"seed_hash_{table}"
+            src_hash, main_hash = conn.execute("""
+                SELECT
+                    (SELECT value FROM src.db_metadata WHERE key = ?),
+                    (SELECT value FROM main.db_metadata WHERE key = ?)
+            """, (metadata_key, metadata_key)).fetchone()
+            if src_hash is not None and src_hash == main_hash:
+                print(f"[SKIP] {table}: sementes inalteradas")
+                continue
+
+            count = conn.execute(_copy_sql(table, seed.columns)).rowcount
+            conn.execute("""
+                INSERT INTO db_metadata (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value, updated_at = CURRENT_TIMESTAMP
+            """, (metadata_key, src_hash))
+            print(f"[OK] {table}: {count} linhas copiadas")
+
+    def populate_seed(self, seed, conn=None):
+        """Popular uma tabela de sementes do registro SEED_TABLES"""
+        print(f"\n[*] Populando {seed.title}...")
+        rows = seed.load(self.version)
+        count = self._populate_table(conn or self.conn, seed.table, seed.columns, rows)
+        if count is not None:
+            print(f"[OK] {count} {seed.label}")
+
+    def populate_all(self, conn=None):
+        """Popular todas as tabelas de sementes, na ordem do registro"""
+        for seed in SEED_TABLES:
+            self.populate_seed(seed, conn)
+
+    def populate_ncm_rules(self, conn=None):
         """Popular NCMs de acucar"""
-        print("\n[*] Populando NCM Rules...")
-
-        ncm_data = [
-            {
-                'ncm': '17011100',
-                'description': 'Açúcar de cana, em bruto',
-                'category': 'ACUCAR_BRUTO',
-                'ipi_rate': 0.00,
-                'is_ipi_exempt': 1,
-                'pis_cofins_regime': 'STANDARD',
-                'keywords': json.dumps(['açúcar', 'cana', 'bruto', 'raw', 'sugar']),
-                'valid_from': '2023-01-01',
-                'valid_until': None,
-                'version': self.version,
-                'sector': 'sucroalcooleiro',
-                'product_type': 'bruto',
-                'notes': 'Açúcar de cana bruto - isento de IPI'
-            },
-            {
-                'ncm': '17011200',
-                'description': 'Açúcar de beterraba, em bruto',
-                'category': 'ACUCAR_BRUTO',
-                'ipi_rate': 0.00,
-                'is_ipi_exempt': 1,
-                'pis_cofins_regime': 'STANDARD',
-                'keywords': json.dumps(['açúcar', 'beterraba', 'bruto', 'sugar', 'beet']),
-                'valid_from': '2023-01-01',
-                'valid_until': None,
-                'version': self.version,
-                'sector': 'sucroalcooleiro',
-                'product_type': 'bruto',
-                'notes': 'Açúcar de beterraba bruto - isento de IPI'
-            },
-            {
-                'ncm': '17019100',
-                'description': 'Açúcar refinado, adicionado de aromatizante ou de corante',
-                'category': 'ACUCAR_REFINADO',
-                'ipi_rate': 0.00,
-                'is_ipi_exempt': 1,
-                'pis_cofins_regime': 'STANDARD',
-                'keywords': json.dumps(['açúcar', 'refinado', 'aromatizante', 'corante', 'refined']),
-                'valid_from': '2023-01-01',
-                'valid_until': None,
-                'version': self.version,
-                'sector': 'sucroalcooleiro',
-                'product_type': 'refinado',
-                'notes': 'Açúcar refinado com aditivos - isento de IPI'
-            },
-            {
-                'ncm': '17019900',
-                'description': 'Outros açúcares de cana ou de beterraba e sacarose quimicamente pura, no estado sólido',
-                'category': 'ACUCAR_OUTROS',
-                'ipi_rate': 0.00,
-                'is_ipi_exempt': 1,
-                'pis_cofins_regime': 'STANDARD',
-                'keywords': json.dumps(['açúcar', 'cristal', 'sacarose', 'sugar', 'crystal']),
-                'valid_from': '2023-01-01',
-                'valid_until': None,
-                'version': self.version,
-                'sector': 'sucroalcooleiro',
-                'product_type': 'cristal',
-                'notes': 'Açúcar cristal e outros - isento de IPI. NCM mais comum para açúcar cristal.'
-            },
-            {
-                'ncm': '17021100',
-                'description': 'Lactose e xarope de lactose',
-                'category': 'OUTROS_ACUCARES',
-                'ipi_rate': 0.00,
-                'is_ipi_exempt': 1,
-                'pis_cofins_regime': 'STANDARD',
-                'keywords': json.dumps(['lactose', 'xarope']),
-                'valid_from': '2023-01-01',
-                'valid_until': None,
-                'version': self.version,
-                'sector': 'sucroalcooleiro',
-                'product_type': 'lactose',
-                'notes': 'Lactose - capítulo 17'
-            },
-        ]
+        self.populate_seed(_SEEDS_BY_TABLE['ncm_rules'], conn)
 
-        cursor = self.conn.cursor()
-        for ncm in ncm_data:
-            cursor.execute("""
-                INSERT OR REPLACE INTO ncm_rules (
-                    ncm, description, category, ipi_rate, is_ipi_exempt,
-                    pis_cofins_regime, keywords, valid_from, valid_until,
-                    version, sector, product_type, notes
-                ) VALUES (
-                    :ncm, :description, :category, :ipi_rate, :is_ipi_exempt,
-                    :pis_cofins_regime, :keywords, :valid_from, :valid_until,
-                    :version, :sector, :product_type, :notes
-                )
-            """, ncm)
-
-        self.conn.commit()
-        print(f"[OK] {len(ncm_data)} NCMs inseridos")
-
-    def populate_pis_cofins_rules(self):
+    def populate_pis_cofins_rules(self, conn=None):
         """Popular CSTs PIS/COFINS"""
-        print("\n[*] Populando PIS/COFINS Rules...")
-
-        cst_data = [
-            {
-                'cst': '01',
-                'description': 'Operação Tributável com Alíquota Básica',
-                'situation_type': 'TRIBUTADA',
-                'pis_rate_standard': 1.65,
-                'cofins_rate_standard': 7.60,
-                'pis_rate_cumulative': 0.65,
-                'cofins_rate_cumulative': 3.00,
-                'requires_base_calculation': 1,
-                'allows_credit': 1,
-                'legal_reference': 'Lei 10.637/2002 e Lei 10.833/2003',
-                'legal_article': 'Art. 2º - Alíquotas de 1,65% (PIS) e 7,6% (COFINS)',
-                'valid_for_operations': json.dumps(['VENDA', 'COMPRA']),
-                'version': self.version,
-                'notes': 'CST mais comum para operações tributadas no regime não-cumulativo'
-            },
-            {
-                'cst': '04',
-                'description': 'Operação Tributável Monofásica - Revenda a Alíquota Zero',
-                'situation_type': 'TRIBUTADA_MONOFASICA',
-                'pis_rate_standard': 0.00,
-                'cofins_rate_standard': 0.00,
-                'pis_rate_cumulative': 0.00,
-                'cofins_rate_cumulative': 0.00,
-                'requires_base_calculation': 0,
-                'allows_credit': 0,
-                'legal_reference': 'Lei 10.637/2002 e Lei 10.833/2003',
-                'legal_article': 'Art. 3º - Tributação monofásica',
-                'valid_for_operations': json.dumps(['VENDA']),
-                'version': self.version,
-                'notes': 'Para produtos com tributação concentrada (combustíveis, bebidas, etc)'
-            },
-            {
-                'cst': '06',
-                'description': 'Operação Tributável a Alíquota Zero',
-                'situation_type': 'ALIQUOTA_ZERO',
-                'pis_rate_standard': 0.00,
-                'cofins_rate_standard': 0.00,
-                'pis_rate_cumulative': 0.00,
-                'cofins_rate_cumulative': 0.00,
-                'requires_base_calculation': 1,
-                'allows_credit': 1,
-                'legal_reference': 'Lei 10.637/2002 e Lei 10.833/2003',
-                'legal_article': 'Art. 5º - Alíquota zero para exportações',
-                'valid_for_operations': json.dumps(['VENDA', 'EXPORTACAO']),
-                'version': self.version,
-                'notes': 'Usado principalmente para exportações'
-            },
-            {
-                'cst': '07',
-                'description': 'Operação Isenta da Contribuição',
-                'situation_type': 'ISENTA',
-                'pis_rate_standard': 0.00,
-                'cofins_rate_standard': 0.00,
-                'pis_rate_cumulative': 0.00,
-                'cofins_rate_cumulative': 0.00,
-                'requires_base_calculation': 0,
-                'allows_credit': 0,
-                'legal_reference': 'Lei 10.637/2002 e Lei 10.833/2003',
-                'legal_article': 'Art. 5º e 6º - Isenções específicas',
-                'valid_for_operations': json.dumps(['VENDA', 'COMPRA']),
-                'version': self.version,
-                'notes': 'Operações com isenção legal'
-            },
-            {
-                'cst': '08',
-                'description': 'Operação sem Incidência da Contribuição',
-                'situation_type': 'NAO_INCIDENCIA',
-                'pis_rate_standard': 0.00,
-                'cofins_rate_standard': 0.00,
-                'pis_rate_cumulative': 0.00,
-                'cofins_rate_cumulative': 0.00,
-                'requires_base_calculation': 0,
-                'allows_credit': 0,
-                'legal_reference': 'Lei 10.637/2002 e Lei 10.833/2003',
-                'legal_article': 'Art. 4º - Operações sem incidência',
-                'valid_for_operations': json.dumps(['VENDA', 'COMPRA', 'EXPORTACAO']),
-                'version': self.version,
-                'notes': 'Operações fora do campo de incidência (ex: exportação)'
-            },
-            {
-                'cst': '49',
-                'description': 'Outras Operações de Saída',
-                'situation_type': 'OUTRAS',
-                'pis_rate_standard': None,
-                'cofins_rate_standard': None,
-                'pis_rate_cumulative': None,
-                'cofins_rate_cumulative': None,
-                'requires_base_calculation': 0,
-                'allows_credit': 0,
-                'legal_reference': 'Lei 10.637/2002 e Lei 10.833/2003',
-                'legal_article': None,
-                'valid_for_operations': json.dumps(['VENDA']),
-                'version': self.version,
-                'notes': 'Outras situações não especificadas'
-            },
-            {
-                'cst': '50',
-                'description': 'Operação com Direito a Crédito - Vinculada Exclusivamente a Receita Tributada',
-                'situation_type': 'TRIBUTADA',
-                'pis_rate_standard': 1.65,
-                'cofins_rate_standard': 7.60,
-                'pis_rate_cumulative': 0.00,
-                'cofins_rate_cumulative': 0.00,
-                'requires_base_calculation': 1,
-                'allows_credit': 1,
-                'legal_reference': 'Lei 10.637/2002 e Lei 10.833/2003',
-                'legal_article': 'Art. 3º - Créditos do regime não-cumulativo',
-                'valid_for_operations': json.dumps(['COMPRA']),
-                'version': self.version,
-                'notes': 'CST de entrada - direito a crédito integral'
-            },
-        ]
+        self.populate_seed(_SEEDS_BY_TABLE['pis_cofins_rules'], conn)
 
-        cursor = self.conn.cursor()
-        for cst in cst_data:
-            cursor.execute("""
-                INSERT OR REPLACE INTO pis_cofins_rules (
-                    cst, description, situation_type,
-                    pis_rate_standard, cofins_rate_standard,
-                    pis_rate_cumulative, cofins_rate_cumulative,
-                    requires_base_calculation, allows_credit,
-                    legal_reference, legal_article, valid_for_operations,
-                    version, notes
-                ) VALUES (
-                    :cst, :description, :situation_type,
-                    :pis_rate_standard, :cofins_rate_standard,
-                    :pis_rate_cumulative, :cofins_rate_cumulative,
-                    :requires_base_calculation, :allows_credit,
-                    :legal_reference, :legal_article, :valid_for_operations,
-                    :version, :notes
-                )
-            """, cst)
-
-        self.conn.commit()
-        print(f"[OK] {len(cst_data)} CSTs PIS/COFINS inseridos")
-
-    def populate_cfop_rules(self):
+    def populate_cfop_rules(self, conn=None):
         """Popular CFOPs comuns"""
-        print("\n[*] Populando CFOP Rules...")
-
-        cfop_data = [
-            # Saídas internas (5xxx)
-            {
-                'cfop': '5101',
-                'description': 'Venda de produção do estabelecimento',
-                'operation_type': 'SAIDA',
-                'operation_scope': 'INTERNO',
-                'nature': 'VENDA',
-                'requires_icms': 1,
-                'requires_ipi': 0,
-                'exempt_pis_cofins': 0,
-                'common_for_sector': 'sucroalcooleiro',
-                'legal_reference': 'Tabela CFOP - Ajuste SINIEF 07/05',
-                'version': self.version,
-                'notes': 'CFOP mais comum para venda interna de açúcar produzido'
-            },
-            {
-                'cfop': '5102',
-                'description': 'Venda de mercadoria adquirida ou recebida de terceiros',
-                'operation_type': 'SAIDA',
-                'operation_scope': 'INTERNO',
-                'nature': 'VENDA',
-                'requires_icms': 1,
-                'requires_ipi': 0,
-                'exempt_pis_cofins': 0,
-                'common_for_sector': 'geral',
-                'legal_reference': 'Tabela CFOP - Ajuste SINIEF 07/05',
-                'version': self.version,
-                'notes': 'Venda interna de mercadoria adquirida (revenda)'
-            },
-
-            # Saídas interestaduais (6xxx)
-            {
-                'cfop': '6101',
-                'description': 'Venda de produção do estabelecimento',
-                'operation_type': 'SAIDA',
-                'operation_scope': 'INTERESTADUAL',
-                'nature': 'VENDA',
-                'requires_icms': 1,
-                'requires_ipi': 0,
-                'exempt_pis_cofins': 0,
-                'common_for_sector': 'sucroalcooleiro',
-                'legal_reference': 'Tabela CFOP - Ajuste SINIEF 07/05',
-                'version': self.version,
-                'notes': 'CFOP mais comum para venda interestadual de açúcar produzido'
-            },
-            {
-                'cfop': '6102',
-                'description': 'Venda de mercadoria adquirida ou recebida de terceiros',
-                'operation_type': 'SAIDA',
-                'operation_scope': 'INTERESTADUAL',
-                'nature': 'VENDA',
-                'requires_icms': 1,
-                'requires_ipi': 0,
-                'exempt_pis_cofins': 0,
-                'common_for_sector': 'geral',
-                'legal_reference': 'Tabela CFOP - Ajuste SINIEF 07/05',
-                'version': self.version,
-                'notes': 'Venda interestadual de mercadoria adquirida (revenda)'
-            },
-
-            # Exportações (7xxx)
-            {
-                'cfop': '7101',
-                'description': 'Venda de produção do estabelecimento',
-                'operation_type': 'SAIDA',
-                'operation_scope': 'EXTERIOR',
-                'nature': 'EXPORTACAO',
-                'requires_icms': 0,
-                'requires_ipi': 0,
-                'exempt_pis_cofins': 1,
-                'common_for_sector': 'sucroalcooleiro',
-                'legal_reference': 'Tabela CFOP - Ajuste SINIEF 07/05',
-                'version': self.version,
-                'notes': 'Exportação - isento de ICMS, IPI, PIS e COFINS'
-            },
-
-            # Entradas internas (1xxx)
-            {
-                'cfop': '1101',
-                'description': 'Compra para industrialização ou produção rural',
-                'operation_type': 'ENTRADA',
-                'operation_scope': 'INTERNO',
-                'nature': 'COMPRA',
-                'requires_icms': 1,
-                'requires_ipi': 0,
-                'exempt_pis_cofins': 0,
-                'common_for_sector': 'geral',
-                'legal_reference': 'Tabela CFOP - Ajuste SINIEF 07/05',
-                'version': self.version,
-                'notes': 'Compra interna para industrialização'
-            },
-
-            # Entradas interestaduais (2xxx)
-            {
-                'cfop': '2101',
-                'description': 'Compra para industrialização ou produção rural',
-                'operation_type': 'ENTRADA',
-                'operation_scope': 'INTERESTADUAL',
-                'nature': 'COMPRA',
-                'requires_icms': 1,
-                'requires_ipi': 0,
-                'exempt_pis_cofins': 0,
-                'common_for_sector': 'geral',
-                'legal_reference': 'Tabela CFOP - Ajuste SINIEF 07/05',
-                'version': self.version,
-                'notes': 'Compra interestadual para industrialização'
-            },
-        ]
+        self.populate_seed(_SEEDS_BY_TABLE['cfop_rules'], conn)
 
-        cursor = self.conn.cursor()
-        for cfop in cfop_data:
-            cursor.execute("""
-                INSERT OR REPLACE INTO cfop_rules (
-                    cfop, description, operation_type, operation_scope,
-                    nature, requires_icms, requires_ipi, exempt_pis_cofins,
-                    common_for_sector, legal_reference, version, notes
-                ) VALUES (
-                    :cfop, :description, :operation_type, :operation_scope,
-                    :nature, :requires_icms, :requires_ipi, :exempt_pis_cofins,
-                    :common_for_sector, :legal_reference, :version, :notes
-                )
-            """, cfop)
-
-        self.conn.commit()
-        print(f"[OK] {len(cfop_data)} CFOPs inseridos")
-
-    def populate_state_overrides(self):
+    def populate_state_overrides(self, conn=None):
         """Popular regras estaduais SP + PE (overlay mínimo MVP)"""
-        print("\n[*] Populando State Overrides (SP + PE)...")
-
-        state_data = [
-            # São Paulo
-            {
-                'state': 'SP',
-                'override_type': 'ICMS',
-                'ncm': '17019900',
-                'cfop': None,
-                'sector': 'sucroalcooleiro',
-                'rule_name': 'ICMS Padrão Açúcar SP',
-                'rule_description': 'Alíquota padrão de ICMS para açúcar em operações internas em SP',
-                'icms_rate': 18.00,
-                'icms_reduction_rate': None,
-                'is_st': 0,
-                'st_mva': None,
-                'legal_reference': 'RICMS/SP Decreto 45.490/2000',
-                'legal_article': 'Art. 52 - Alíquota interna de 18%',
-                'decree_number': 'Decreto 45.490/2000',
-                'valid_from': '2023-01-01',
-                'valid_until': None,
-                'version': self.version,
-                'severity': 'WARNING',
-                'notes': 'MVP: validação mínima - apenas warning se divergir'
-            },
-            {
-                'state': 'SP',
-                'override_type': 'REDUCAO_BC',
-                'ncm': None,
-                'cfop': '5101',
-                'sector': 'sucroalcooleiro',
-                'rule_name': 'Redução BC ICMS - Produtos Primários',
-                'rule_description': 'Alguns produtos primários podem ter redução de base de cálculo em SP',
-                'icms_rate': 18.00,
-                'icms_reduction_rate': 0.00,  # MVP: sem redução por padrão
-                'is_st': 0,
-                'st_mva': None,
-                'legal_reference': 'RICMS/SP Decreto 45.490/2000',
-                'legal_article': 'Art. 53 - Verificar convênios específicos',
-                'decree_number': 'Decreto 45.490/2000',
-                'valid_from': '2023-01-01',
-                'valid_until': None,
-                'version': self.version,
-                'severity': 'INFO',
-                'notes': 'MVP: informativo - verificar legislação específica se aplicável'
-            },
-
-            # Pernambuco
-            {
-                'state': 'PE',
-                'override_type': 'ICMS',
-                'ncm': '17019900',
-                'cfop': None,
-                'sector': 'sucroalcooleiro',
-                'rule_name': 'ICMS Padrão Açúcar PE',
-                'rule_description': 'Alíquota padrão de ICMS para açúcar em operações internas em PE',
-                'icms_rate': 18.00,
-                'icms_reduction_rate': None,
-                'is_st': 0,
-                'st_mva': None,
-                'legal_reference': 'RICMS/PE Decreto 14.876/1991',
-                'legal_article': 'Art. 18 - Alíquota interna de 18%',
-                'decree_number': 'Decreto 14.876/1991',
-                'valid_from': '2023-01-01',
-                'valid_until': None,
-                'version': self.version,
-                'severity': 'WARNING',
-                'notes': 'MVP: validação mínima - apenas warning se divergir'
-            },
-        ]
+        self.populate_seed(_SEEDS_BY_TABLE['state_overrides'], conn)
 
-        cursor = self.conn.cursor()
-        for state_rule in state_data:
-            cursor.execute("""
-                INSERT OR REPLACE INTO state_overrides (
-                    state, override_type, ncm, cfop, sector,
-                    rule_name, rule_description, icms_rate, icms_reduction_rate,
-                    is_st, st_mva, legal_reference, legal_article, decree_number,
-                    valid_from, valid_until, version, severity, notes
-                ) VALUES (
-                    :state, :override_type, :ncm, :cfop, :sector,
-                    :rule_name, :rule_description, :icms_rate, :icms_reduction_rate,
-                    :is_st, :st_mva, :legal_reference, :legal_article, :decree_number,
-                    :valid_from, :valid_until, :version, :severity, :notes
-                )
-            """, state_rule)
-
-        self.conn.commit()
-        print(f"[OK] {len(state_data)} regras estaduais (SP + PE) inseridas")
-
-    def populate_legal_refs(self):
+    def populate_legal_refs(self, conn=None):
         """Popular referências legais"""
-        print("\n[*] Populando Legal References...")
-
-        legal_data = [
-            {
-                'code': 'LEI_10637',
-                'ref_type': 'LEI',
-                'number': '10.637',
-                'year': 2002,
-                'title': 'Lei do PIS não-cumulativo',
-                'summary': 'Dispõe sobre a não-cumulatividade na cobrança da contribuição para o PIS/PASEP',
-                'issuing_body': 'RECEITA_FEDERAL',
-                'scope': 'FEDERAL',
-                'applicable_states': None,
-                'full_text': None,
-                'url': 'http://www.planalto.gov.br/ccivil_03/leis/2002/l10637.htm',
-                'relevant_articles': json.dumps({
-                    'Art. 2º': 'Alíquota de 1,65%',
-                    'Art. 3º': 'Direito ao crédito',
-                    'Art. 5º': 'Isenções e alíquota zero'
-                }),
-                'affects_taxes': json.dumps(['PIS']),
-                'published_date': '2002-12-30',
-                'effective_date': '2002-12-01',
-                'revoked_date': None,
-                'version': self.version,
-                'notes': 'Lei fundamental do PIS não-cumulativo'
-            },
-            {
-                'code': 'LEI_10833',
-                'ref_type': 'LEI',
-                'number': '10.833',
-                'year': 2003,
-                'title': 'Lei da COFINS não-cumulativa',
-                'summary': 'Institui a Contribuição para o Financiamento da Seguridade Social não-cumulativa',
-                'issuing_body': 'RECEITA_FEDERAL',
-                'scope': 'FEDERAL',
-                'applicable_states': None,
-                'full_text': None,
-                'url': 'http://www.planalto.gov.br/ccivil_03/leis/2003/l10.833.htm',
-                'relevant_articles': json.dumps({
-                    'Art. 2º': 'Alíquota de 7,6%',
-                    'Art. 3º': 'Direito ao crédito',
-                    'Art. 6º': 'Isenções e alíquota zero'
-                }),
-                'affects_taxes': json.dumps(['COFINS']),
-                'published_date': '2003-12-29',
-                'effective_date': '2004-02-01',
-                'revoked_date': None,
-                'version': self.version,
-                'notes': 'Lei fundamental da COFINS não-cumulativa'
-            },
-            {
-                'code': 'IN_2121',
-                'ref_type': 'INSTRUCAO_NORMATIVA',
-                'number': '2.121',
-                'year': 2022,
-                'title': 'Instrução Normativa RFB nº 2.121/2022',
-                'summary': 'Dispõe sobre a Nomenclatura Comum do Mercosul (NCM)',
-                'issuing_body': 'RECEITA_FEDERAL',
-                'scope': 'FEDERAL',
-                'applicable_states': None,
-                'full_text': None,
-                'url': 'https://www.gov.br/receitafederal/pt-br/assuntos/aduana-e-comercio-exterior/manuais/importacao/topicos-1/classificacao-fiscal/nomenclatura-comum-do-mercosul-ncm',
-                'relevant_articles': json.dumps({
-                    'Anexo I': 'Tabela NCM completa',
-                    'Capítulo 17': 'Açúcares e produtos de confeitaria'
-                }),
-                'affects_taxes': json.dumps(['ICMS', 'IPI', 'II']),
-                'published_date': '2022-12-23',
-                'effective_date': '2023-01-01',
-                'revoked_date': None,
-                'version': self.version,
-                'notes': 'Tabela NCM vigente - atualizada anualmente'
-            },
-            {
-                'code': 'TIPI_17',
-                'ref_type': 'TABELA',
-                'number': 'Capítulo 17',
-                'year': 2023,
-                'title': 'TIPI - Tabela de Incidência do Imposto sobre Produtos Industrializados - Capítulo 17',
-                'summary': 'Açúcares e produtos de confeitaria - NCMs e alíquotas de IPI',
-                'issuing_body': 'RECEITA_FEDERAL',
-                'scope': 'FEDERAL',
-                'applicable_states': None,
-                'full_text': None,
-                'url': 'https://www.gov.br/receitafederal/pt-br/assuntos/aduana-e-comercio-exterior/manuais/importacao/topicos-1/classificacao-fiscal/tipi',
-                'relevant_articles': json.dumps({
-                    '1701': 'Açúcares de cana ou de beterraba - IPI: 0% (isento)',
-                    '1702': 'Outros açúcares - IPI variável'
-                }),
-                'affects_taxes': json.dumps(['IPI']),
-                'published_date': '2023-01-01',
-                'effective_date': '2023-01-01',
-                'revoked_date': None,
-                'version': self.version,
-                'notes': 'Açúcar do capítulo 17 geralmente isento de IPI'
-            },
-            {
-                'code': 'SINIEF_0705',
-                'ref_type': 'AJUSTE',
-                'number': '07/05',
-                'year': 2005,
-                'title': 'Ajuste SINIEF 07/05 - Tabela CFOP',
-                'summary': 'Código Fiscal de Operações e Prestações - Tabela completa',
-                'issuing_body': 'CONFAZ',
-                'scope': 'FEDERAL',
-                'applicable_states': json.dumps(['ALL']),
-                'full_text': None,
-                'url': 'https://www.confaz.fazenda.gov.br/legislacao/ajustes/2005/ajuste-sinief-07-05',
-                'relevant_articles': json.dumps({
-                    'Anexo I': 'Tabela CFOP completa'
-                }),
-                'affects_taxes': json.dumps(['ICMS']),
-                'published_date': '2005-07-30',
-                'effective_date': '2005-10-01',
-                'revoked_date': None,
-                'version': self.version,
-                'notes': 'Tabela CFOP oficial - base para validação'
-            },
-        ]
-
-        cursor = self.conn.cursor()
-        for legal in legal_data:
-            cursor.execute("""
-                INSERT OR REPLACE INTO legal_refs (
-                    code, ref_type, number, year, title, summary,
-                    issuing_body, scope, applicable_states, full_text, url,
-                    relevant_articles, affects_taxes, published_date,
-                    effective_date, revoked_date, version, notes
-                ) VALUES (
-                    :code, :ref_type, :number, :year, :title, :summary,
-                    :issuing_body, :scope, :applicable_states, :full_text, :url,
-                    :relevant_articles, :affects_taxes, :published_date,
-                    :effective_date, :revoked_date, :version, :notes
-                )
-            """, legal)
-
-        self.conn.commit()
-        print(f"[OK] {len(legal_data)} referências legais inseridas")
+        self.populate_seed(_SEEDS_BY_TABLE['legal_refs'], conn)
 
     def update_metadata(self):
         """Atualizar metadata do database"""
@@ -657,44 +867,30 @@ class DatabasePopulator:
             SET value = ?, updated_at = CURRENT_TIMESTAMP
             WHERE key = 'last_population'
         """, (date.today().isoformat(),))
-        self.conn.commit()
         print("\n[OK] Metadata atualizada")
 
     def verify_population(self):
         """Verificar população do database"""
         print("\n[INFO] Verificando população...")
 
-        cursor = self.conn.cursor()
-
-        # Contar registros
-        counts = {}
-        tables = ['ncm_rules', 'pis_cofins_rules', 'cfop_rules', 'state_overrides', 'legal_refs']
+        # Todas as contagens (tabelas + views) numa única consulta
+        row = self.conn.execute(_COUNTS_SQL).fetchone()
+        counts = dict(zip(_COUNT_TABLES, row[:len(_COUNT_TABLES)]))
+        sugar_ncms, valid_csts, sugar_cfops, state_rules = row[len(_COUNT_TABLES):]
 
-        for table in tables:
-            cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            counts[table] = cursor.fetchone()[0]
-
-        print("\n[STATS] Estatísticas:")
-        for table, count in counts.items():
-            print(f"  • {table}: {count} registros")
+        # Relatório montado em memória e escrito numa única chamada
+        lines = ["", "[STATS] Estatísticas:"]
+        lines += [f"  • {table}: {count} registros" for table, count in counts.items()]
 
         # Testar views
-        print("\n[CHECK] Testando views...")
-        cursor.execute("SELECT COUNT(*) FROM v_sugar_ncms")
-        sugar_ncms = cursor.fetchone()[0]
-        print(f"  • v_sugar_ncms: {sugar_ncms} NCMs de açúcar")
-
-        cursor.execute("SELECT COUNT(*) FROM v_valid_csts")
-        valid_csts = cursor.fetchone()[0]
-        print(f"  • v_valid_csts: {valid_csts} CSTs válidos")
-
-        cursor.execute("SELECT COUNT(*) FROM v_sugar_cfops")
-        sugar_cfops = cursor.fetchone()[0]
-        print(f"  • v_sugar_cfops: {sugar_cfops} CFOPs comuns")
-
-        cursor.execute("SELECT COUNT(*) FROM v_state_rules_active")
-        state_rules = cursor.fetchone()[0]
-        print(f"  • v_state_rules_active: {state_rules} regras SP+PE ativas")
+        lines += [
+            "", "[CHECK] Testando views...",
+            f"  • v_sugar_ncms: {sugar_ncms} NCMs de açúcar",
+            f"  • v_valid_csts: {valid_csts} CSTs válidos",
+            f"  • v_sugar_cfops: {sugar_cfops} CFOPs comuns",
+            f"  • v_state_rules_active: {state_rules} regras SP+PE ativas",
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
 
         return counts
 
@@ -705,8 +901,11 @@ class DatabasePopulator:
             print("\n[OK] Conexão fechada")
 
 
-def main():
-    """Main function"""
+def main(verify=False):
+    """Main function (verify=True confere contagens e views após a carga)
+
+    Retorna o status de saída: 0 em caso de sucesso, 1 em caso de falha.
+    """
     print("=" * 60)
     print("NF-e Validator - Database Population")
     print("MVP Sucroalcooleiro - Açúcar (SP + PE)")
@@ -717,6 +916,8 @@ def main():
     project_root = script_dir.parent
     db_path = project_root / "src" / "database" / "rules.db"
     schema_path = project_root / "src" / "database" / "schema.sql"
+    # Gerado em tempo de release por scripts/build_seeds.py (opcional)
+    seeds_path = project_root / "data" / "seeds.db"
 
     # Criar diretório se não existir
     db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -724,10 +925,15 @@ def main():
     # Verificar se schema existe
     if not schema_path.exists():
         print(f"[ERROR] Schema não encontrado: {schema_path}")
-        return
+        return 1
+
+    # Build do zero em memória (sem journal/fsync) e gravado no fim com
+    # VACUUM INTO; um rules.db existente é atualizado no lugar, preservando
+    # o que outros scripts carregaram (ex.: legal_refs completas)
+    fresh_build = not db_path.exists()
 
     # Criar populator
-    populator = DatabasePopulator(str(db_path))
+    populator = DatabasePopulator(":memory:" if fresh_build else str(db_path))
 
     try:
         # Conectar
@@ -735,36 +941,58 @@ def main():
 
         # Criar schema
         print("\n[BUILD] Criando schema...")
-        populator.create_schema(str(schema_path))
-
-        # Popular tabelas
-        populator.populate_ncm_rules()
-        populator.populate_pis_cofins_rules()
-        populator.populate_cfop_rules()
-        populator.populate_state_overrides()
-        populator.populate_legal_refs()
+        populator.create_schema_tables_only(str(schema_path))
+
+        # Snapshot só vale se gerado a partir das fontes atuais (data/*.csv e
+        # SEED_TABLES); senão as sementes são carregadas direto das fontes
+        use_snapshot = seeds_path.exists()
+        if use_snapshot and not populator.snapshot_is_current(seeds_path):
+            print(f"[WARN] Snapshot desatualizado em relação às fontes: {seeds_path}")
+            print("[WARN] Populando a partir das fontes (rode scripts/build_seeds.py)")
+            use_snapshot = False
+        if use_snapshot:
+            populator.attach_snapshot(seeds_path)
+
+        # Popular tabelas (tudo numa única transação)
+        populator.begin()
+        if use_snapshot:
+            populator.populate_from_snapshot()
+        else:
+            populator.populate_all()
 
         # Atualizar metadata
         populator.update_metadata()
 
-        # Verificar
-        counts = populator.verify_population()
+        # Índices secundários só depois da carga
+        populator.create_indexes(str(schema_path))
+
+        # Verificar (opcional: só leituras e prints)
+        counts = populator.verify_population() if verify else None
+        populator.finalize()
+        if use_snapshot:
+            populator.detach_snapshot()
+        if fresh_build:
+            populator.vacuum_into(db_path)
 
         # Resumo final
         print("\n" + "=" * 60)
         print("[OK] DATABASE POPULADO COM SUCESSO!")
         print("=" * 60)
         print(f"\n[LOCATION] Database: {db_path}")
-        print(f"[INFO] Total de registros: {sum(counts.values())}")
+        if counts:
+            print(f"[INFO] Total de registros: {sum(counts.values())}")
+        return 0
 
     except Exception as e:
+        populator.rollback()
         print(f"\n[ERROR] Erro durante população: {e}")
         import traceback
         traceback.print_exc()
+        return 1
 
     finally:
         populator.close()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main(verify='--verify' in sys.argv[1:]))
@@ -3,9 +3,38 @@
 Módulo de Agentes IA
 
 Este módulo contém os agentes de inteligência artificial para análise de dados.
+
+Os agentes são importados sob demanda (PEP 562): `import agents` não carrega
+pandas/LangChain até que um deles seja usado.
 """
 
-from .eda_agent import EDAAgent
-from .ncm_agent import NCMReActAgent, create_ncm_agent
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .eda_agent import EDAAgent
+    from .ncm_agent import NCMReActAgent, create_ncm_agent
+
+__all__ = ['EDAAgent', 'NCMReActAgent', 'create_ncm_agent']
+
+# Nome exportado -> submódulo que o define
+_LAZY_ATTRS = {
+    'EDAAgent': '.eda_agent',
+    'NCMReActAgent': '.ncm_agent',
+    'create_ncm_agent': '.ncm_agent',
+}
+
+
+def __getattr__(name):
+    """Importar o agente no primeiro acesso e guardá-lo no módulo"""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['EDAAgent', 'NCMReActAgent', 'create_ncm_agent']
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,6 +6,9 @@ This module contains the main EDA agent that can analyze CSV files and answer qu
 about data using various analysis techniques and visualizations.
 """
 
+import codecs
+import csv
+import chardet
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -17,11 +20,300 @@ from langchain.memory import ConversationBufferMemory
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.tools import tool
 from langchain.schema.output_parser import StrOutputParser
+from langchain_core.messages import AIMessage, ToolMessage
+import asyncio
 import io
+import json
+import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import redirect_stdout, redirect_stderr
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow é opcional: sem ele a leitura parcial usa o engine C
+    pa = None
+    pc = None
+    pa_csv = None
+
+try:
+    from numba import get_num_threads, njit, prange
+except ImportError:  # numba é opcional: sem ele os outliers usam o caminho pandas
+    njit = None
+    prange = range
 # offline_analyzer removido - não mais necessário
 
+# Amostra usada para detectar encoding e separador antes da leitura única
+SNIFF_SAMPLE_BYTES = 65536
+
+# Com max_rows, arquivos estimados acima deste número de linhas são lidos em
+# blocos (do pyarrow, ou de READ_CHUNK_ROWS no engine C), parando assim que o
+# limite é atingido
+CHUNKED_READ_MIN_ROWS = 100_000
+READ_CHUNK_ROWS = 65_536
+
+# Cache Parquet ao lado do CSV ({arquivo}.parquet + {arquivo}.parquet.meta.json),
+# válido enquanto mtime/tamanho do CSV e a versão abaixo não mudarem.
+# Incrementar a versão quando a limpeza/pré-processamento mudar.
+PARQUET_CACHE_VERSION = 1
+
+# Correção de CSV mal formado (aspas duplicadas aninhadas)
+_MALFORMED_HEADER_RE = re.compile(r'^"Time,[^\n]*', re.M)
+_LINE_EDGE_SPACE_RE = re.compile(r'^[^\S\n]+|[^\S\n]+$', re.M)
+_DOUBLED_QUOTE_LINE_RE = re.compile(r'^[^\n]*""[^\n]*$', re.M)
+_COMMA_RUN_RE = re.compile(r',{2,}')
+
+# Campos entre aspas, ignorados ao procurar espaço após o separador
+_QUOTED_FIELD_RE = re.compile(r'"[^"]*"')
+
+
+def _lerp(a: float, b: float, t: float) -> float:
+    """Linear interpolation computed exactly like NumPy's quantile (method='linear')"""
+    diff = b - a
+    if t >= 0.5:
+        return b - diff * (1.0 - t)
+    return a + diff * t
+
+
+def _select_quantile(values, q: float) -> float:
+    """Linear quantile of a NaN-free array by partial selection (no full sort)"""
+    position = q * (values.size - 1)
+    below = int(np.floor(position))
+    part = np.partition(values, below)
+    low = part[below]
+    high = part[below + 1:].min() if below + 1 < values.size else low
+    return _lerp(low, high, position - below)
+
+
+def _iqr_outliers_kernel(arr):
+    """IQR bounds and outlier counts per column of a float64 matrix (NaN ignored)"""
+    n_cols = arr.shape[1]
+    lower = np.full(n_cols, np.nan)
+    upper = np.full(n_cols, np.nan)
+    counts = np.zeros(n_cols, dtype=np.int64)
+    for j in prange(n_cols):
+        col = arr[:, j]
+        values = col[~np.isnan(col)]
+        if values.size == 0:
+            continue
+        q1 = _select_quantile(values, 0.25)
+        q3 = _select_quantile(values, 0.75)
+        iqr = q3 - q1
+        lower[j] = q1 - 1.5 * iqr
+        upper[j] = q3 + 1.5 * iqr
+        count = 0
+        for v in col:
+            if v < lower[j] or v > upper[j]:
+                count += 1
+        counts[j] = count
+    return lower, upper, counts
+
+
+# Compilado na primeira chamada (cache em disco) quando numba está disponível.
+# Só compensa com várias threads e acima de JIT_MIN_CELLS; com uma thread o
+# caminho pandas (quantile + máscara) empata ou ganha
+JIT_MIN_CELLS = 1_000_000
+if njit is not None:
+    _lerp = njit(cache=True)(_lerp)
+    _select_quantile = njit(cache=True)(_select_quantile)
+    _iqr_outliers_jit = njit(parallel=True, cache=True)(_iqr_outliers_kernel)
+else:
+    _iqr_outliers_jit = None
+
+
+def _pearson_corr(arr: np.ndarray) -> np.ndarray:
+    """Pearson correlation of a NaN-free float64 matrix via a single BLAS gemm
+
+    Constant columns get NaN, matching DataFrame.corr().
+    """
+    centered = arr - arr.mean(axis=0)
+    norms = np.sqrt(np.einsum('ij,ij->j', centered, centered))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        centered /= norms
+    corr = centered.T @ centered
+    np.clip(corr, -1.0, 1.0, out=corr)
+    corr[np.diag_indices_from(corr)] = np.where(norms > 0, 1.0, np.nan)
+    return corr
+
+
+# Parte fixa (por dataset) do prompt de geração de código; a pergunta vai no
+# final para o prefixo ser igual entre chamadas
+_CODE_GEN_PROMPT = """Você tem um DataFrame pandas chamado 'data' com {rows} linhas e {cols} colunas.
+Colunas (tipo): {columns}
+
+Variáveis disponíveis: data, pd (pandas), np (numpy), plt (matplotlib.pyplot), sns (seaborn), os, timestamp (string única para nomes de arquivo).
+
+Gere código Python que responda especificamente à pergunta do usuário. O código deve:
+1. Usar sempre 'data' como nome do DataFrame e fazer os cálculos necessários
+2. Imprimir resultados claros e informativos com print()
+3. Gerar gráficos com matplotlib/seaborn quando apropriado, salvando como PNG em charts/ com o timestamp no nome e fechando cada figura com plt.close()
+4. Tirar conclusões baseadas nos dados analisados
+
+Exemplo:
+```python
+col = data.select_dtypes(include=[np.number]).columns[0]
+print(data[col].describe())
+data[col].hist(bins=30)
+plt.savefig(f'charts/{{timestamp}}_hist_{{col}}.png', dpi=300, bbox_inches='tight')
+plt.close()
+```
+"""
+
+# Caracteres removidos por str.strip() sem argumentos (str.isspace), para os
+# kernels de trim do Arrow darem o mesmo resultado
+_PY_WHITESPACE = (
+    '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004'
+    '\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000'
+)
+
+
+def _strip_quotes(series: pd.Series) -> pd.Series:
+    """Strip whitespace and outer quotes, then collapse \"\" and \'\' (values as str)
+
+    Uses Arrow string kernels when pyarrow is available: object-dtype .str
+    methods loop in Python, Arrow runs each step as one C++ pass.
+    """
+    if pc is None:
+        return (series.astype(str).str.strip().str.strip('"').str.strip("'")
+                .str.replace('""', '"', regex=False).str.replace("''", "'", regex=False))
+
+    values = pa.array(series.astype(str))
+    values = pc.utf8_trim(values, characters=_PY_WHITESPACE)
+    values = pc.utf8_trim(values, characters='"')
+    values = pc.utf8_trim(values, characters="'")
+    values = pc.replace_substring(values, pattern='""', replacement='"')
+    values = pc.replace_substring(values, pattern="''", replacement="'")
+    return pd.Series(values.to_pandas(), index=series.index, name=series.name)
+
+
+def _strip_bom_whitespace(series: pd.Series) -> pd.Series:
+    """Remove BOM characters and surrounding whitespace (values as str)"""
+    if pc is None:
+        return series.astype(str).str.replace('\ufeff', '', regex=False).str.strip()
+
+    values = pa.array(series.astype(str))
+    values = pc.replace_substring(values, pattern='\ufeff', replacement='')
+    values = pc.utf8_trim(values, characters=_PY_WHITESPACE)
+    return pd.Series(values.to_pandas(), index=series.index, name=series.name)
+
+
+def _fix_doubled_quote_line(match) -> str:
+    """'""' and ',' separate fields, lone quotes are dropped, empty fields removed"""
+    line = match.group(0).replace('""', ',').replace('"', '')
+    return _COMMA_RUN_RE.sub(',', line).strip(',')
+
+
+def _is_ascii_space(byte) -> bool:
+    """ASCII bytes matched by [^\\S\\n] (tab, VT, FF, CR, \\x1c-\\x1f, space)"""
+    return byte == 32 or 9 <= byte <= 13 and byte != 10 or 28 <= byte <= 31
+
+
+def _fix_quoted_lines_kernel(buf, out) -> int:
+    """
+    Byte version of the edge-space and doubled-quote passes of _fix_malformed_csv
+
+    Only valid for ASCII text. Writes the fixed bytes to out and returns how
+    many were written (never more than len(buf)).
+    """
+    n = buf.size
+    written = 0
+    start = 0
+    while start < n:
+        end = start
+        while end < n and buf[end] != 10:
+            end += 1
+        line_end = end
+
+        # Strip surrounding whitespace
+        while start < end and _is_ascii_space(buf[start]):
+            start += 1
+        while end > start and _is_ascii_space(buf[end - 1]):
+            end -= 1
+
+        doubled = False
+        for i in range(start, end - 1):
+            if buf[i] == 34 and buf[i + 1] == 34:
+                doubled = True
+                break
+
+        if not doubled:
+            for i in range(start, end):
+                out[written] = buf[i]
+                written += 1
+        else:
+            # "" -> ',', lone " dropped, comma runs collapsed, edge commas dropped
+            has_field = False
+            pending_comma = False
+            i = start
+            while i < end:
+                byte = buf[i]
+                if byte == 34:
+                    if i + 1 < end and buf[i + 1] == 34:
+                        byte = 44
+                        i += 1
+                    else:
+                        i += 1
+                        continue
+                i += 1
+                if byte == 44:
+                    pending_comma = has_field
+                    continue
+                if pending_comma:
+                    out[written] = 44
+                    written += 1
+                    pending_comma = False
+                out[written] = byte
+                written += 1
+                has_field = True
+
+        if line_end < n:
+            out[written] = 10
+            written += 1
+        start = line_end + 1
+    return written
+
+
+# Acima de FIX_JIT_MIN_BYTES de texto ASCII, os passes por linha rodam
+# compilados (numba) em vez de re + callback Python por linha
+FIX_JIT_MIN_BYTES = 4_000_000
+if njit is not None:
+    _is_ascii_space = njit(cache=True)(_is_ascii_space)
+    _fix_quoted_lines_jit = njit(cache=True)(_fix_quoted_lines_kernel)
+else:
+    _fix_quoted_lines_jit = None
+
+
+# Marcador que substitui respostas/observações fora da janela de atenção
+OBSERVATION_MASK = "<MASKED: observation too old>"
+
+
+class ObservationMaskingMemory(ConversationBufferMemory):
+    """
+    Conversation buffer that masks old observations instead of summarizing them
+
+    User messages are always kept, so the dialogue flow survives; AI/tool
+    messages older than the last attention_window messages have their content
+    replaced by OBSERVATION_MASK. Unlike ConversationSummaryBufferMemory this
+    costs no LLM call.
+    """
+
+    attention_window: int = 20
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, Any]) -> None:
+        super().save_context(inputs, outputs)
+        self.prune()
+
+    def prune(self) -> None:
+        """Mask AI/tool messages that fell out of the attention window"""
+        messages = self.chat_memory.messages
+        for message in messages[:max(len(messages) - self.attention_window, 0)]:
+            if isinstance(message, (AIMessage, ToolMessage)) and message.content != OBSERVATION_MASK:
+                message.content = OBSERVATION_MASK
+
+
 class EDAAgent:
     """
     Main EDA Agent class that provides comprehensive data analysis capabilities
@@ -48,6 +340,7 @@ class EDAAgent:
         self.llm = None
         self.api_available = False
         self.chart_callback = None
+        self._schema_cache = None  # Esquema do dataset atual (ver _get_schema)
 
         # Sistema de memória expandido para conclusões e contexto
         self.analysis_history = []  # Histórico de análises realizadas
@@ -71,16 +364,14 @@ class EDAAgent:
         # SEMPRE inicializar agentes quando API estiver disponível
         if self.api_available:
             print(f"✅ {model_type.title()} inicializado - configurando agentes...")
-            # Memória aprimorada para manter contexto de análises
-            from langchain.memory import ConversationSummaryBufferMemory
-
-            self.memory = ConversationSummaryBufferMemory(
-                llm=self.llm,
+            # Memória com janela de atenção: mensagens antigas do agente são
+            # mascaradas em vez de resumidas (sem chamada extra ao LLM)
+            self.memory = ObservationMaskingMemory(
                 memory_key="chat_history",
                 return_messages=True,
                 input_key="input",
-                max_token_limit=2000,  # Manter histórico substancial
-                summary_message_cls=None  # Usar mensagens padrão
+                output_key="output",  # executor também devolve intermediate_steps
+                attention_window=20,
             )
             self.tools = self._create_tools()
             self.agent_executor = self._create_agent()
@@ -98,32 +389,23 @@ class EDAAgent:
                 'gemini-2.0-flash-exp'
             ]
 
-            for model_name in models_to_try:
-                try:
-                    print(f"🔄 Tentando inicializar {model_name}...")
-                    self.llm = ChatGoogleGenerativeAI(
-                        temperature=0.1,
-                        model=model_name,
-                        google_api_key=api_key,
-                        max_output_tokens=4096,  # Valor mais conservador
-                        convert_system_message_to_human=True,
-                        max_retries=2,  # Reduzido para evitar loops
-                        request_timeout=120,  # Timeout aumentado para 2 min
-                        streaming=False  # Desabilitar streaming que pode causar problemas
-                    )
-
-                    # Testar inicialização com uma pergunta simples
-                    test_response = self.llm.invoke([{"role": "user", "content": "Teste: responda apenas 'OK'"}])
-                    if test_response and test_response.content:
-                        self.api_available = True
-                        print(f"✅ Google Gemini inicializado com sucesso: {model_name}")
-                        return
-                    else:
-                        print(f"⚠️ {model_name} retornou resposta vazia")
+            # Testar todos os modelos em paralelo; o escolhido continua sendo o
+            # primeiro da lista que responder
+            probe = self._probe_gemini_models(api_key, models_to_try)
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                model_name, llm = asyncio.run(probe)
+            else:
+                # Já dentro de um event loop (ex.: notebook): sondar numa thread própria
+                with ThreadPoolExecutor(max_workers=1) as pool:
+                    model_name, llm = pool.submit(asyncio.run, probe).result()
 
-                except Exception as model_error:
-                    print(f"❌ Falha com {model_name}: {model_error}")
-                    continue
+            if llm is not None:
+                self.llm = llm
+                self.api_available = True
+                print(f"✅ Google Gemini inicializado com sucesso: {model_name}")
+                return
 
             # Se chegou aqui, nenhum modelo funcionou
             raise Exception("Nenhum modelo Gemini disponível funcionou")
@@ -132,6 +414,59 @@ class EDAAgent:
             print(f"❌ Falha ao inicializar Google Gemini: {e}")
             self.api_available = False
 
+    async def _probe_gemini_models(self, api_key: str, models_to_try: List[str]):
+        """
+        Send the test prompt to every Gemini model concurrently
+
+        Args:
+            api_key (str): Google API key
+            models_to_try (List[str]): Model names in priority order
+
+        Returns:
+            tuple: (model_name, llm) of the first model in priority order that
+            answered, or (None, None) if none did
+        """
+        candidates = []
+        for model_name in models_to_try:
+            print(f"🔄 Tentando inicializar {model_name}...")
+            llm = ChatGoogleGenerativeAI(
+                temperature=0.1,
+                model=model_name,
+                google_api_key=api_key,
+                max_output_tokens=4096,  # Valor mais conservador
+                convert_system_message_to_human=True,
+                max_retries=2,  # Reduzido para evitar loops
+                request_timeout=120,  # Timeout aumentado para 2 min
+                streaming=False  # Desabilitar streaming que pode causar problemas
+            )
+            # Testar inicialização com uma pergunta simples
+            task = asyncio.ensure_future(
+                llm.ainvoke([{"role": "user", "content": "Teste: responda apenas 'OK'"}])
+            )
+            candidates.append((model_name, llm, task))
+
+        try:
+            # Wait in priority order: a slower preferred model still wins, but a
+            # failing one costs no extra round-trip since the others already ran
+            for model_name, llm, task in candidates:
+                try:
+                    test_response = await task
+                except Exception as model_error:
+                    print(f"❌ Falha com {model_name}: {model_error}")
+                    continue
+
+                if test_response and test_response.content:
+                    return model_name, llm
+                print(f"⚠️ {model_name} retornou resposta vazia")
+
+            return None, None
+        finally:
+            for _, _, task in candidates:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # mark as retrieved (no "never retrieved" warning)
+
     def _init_openai(self, api_key: str):
         """Initialize OpenAI"""
         try:
@@ -183,81 +518,92 @@ class EDAAgent:
             print(f"❌ Falha ao configurar Grok: {e}")
             self.api_available = False
 
-    def load_data(self, file_path: str) -> bool:
+    def load_data(self, file_path: str, max_rows: Optional[int] = None) -> bool:
         """
         Load CSV data for analysis
 
         Args:
             file_path (str): Path to CSV file
+            max_rows (Optional[int]): Load only the first max_rows rows (None loads all)
 
         Returns:
             bool: True if successful, False otherwise
         """
         try:
+            self._schema_cache = None
+
+            # Already parsed and cleaned in a previous session: read the Parquet cache
+            if max_rows is None and self._load_parquet_cache(file_path):
+                return True
+
             # Try different encodings and separators for better compatibility
             encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
             separators = [',', ';', '\t']
 
-            self.data = None
+            # Fast path: one read with encoding/separator sniffed from a sample
+            self.data = self._read_csv_sniffed(file_path, max_rows)
             load_error = None
 
-            for encoding in encodings:
-                for sep in separators:
-                    # Try multiple reading strategies
-                    reading_strategies = [
-                        # Strategy 1: Handle malformed CSV with nested quotes
-                        {
-                            'encoding': encoding,
-                            'sep': sep,
-                            'low_memory': False,
-                            'quoting': 1,  # QUOTE_ALL
-                            'doublequote': True,
-                            'skipinitialspace': True
-                        },
-                        # Strategy 2: Standard reading
-                        {
-                            'encoding': encoding,
-                            'sep': sep,
-                            'low_memory': False,
-                            'quotechar': '"',
-                            'skipinitialspace': True
-                        },
-                        # Strategy 3: No quote handling
-                        {
-                            'encoding': encoding,
-                            'sep': sep,
-                            'low_memory': False,
-                            'quoting': 3  # QUOTE_NONE
-                        },
-                        # Strategy 4: Alternative quote character
-                        {
-                            'encoding': encoding,
-                            'sep': sep,
-                            'low_memory': False,
-                            'quotechar': "'",
-                            'skipinitialspace': True
-                        }
-                    ]
-
-                    for strategy_idx, params in enumerate(reading_strategies):
-                        try:
-                            self.data = pd.read_csv(file_path, **params)
-                            if self.data.shape[1] > 1:  # Valid if has more than 1 column
-                                strategy_name = f"estratégia {strategy_idx + 1}"
-                                print(f"✅ Arquivo carregado com encoding '{encoding}', separador '{sep}' ({strategy_name})")
-                                break
-                        except Exception as e:
-                            load_error = e
-                            continue
+            # Fallback: sweep encodings/separators/strategies
+            if self.data is None or self.data.shape[1] <= 1:
+                self.data = None
+                for encoding in encodings:
+                    for sep in separators:
+                        # Try multiple reading strategies
+                        reading_strategies = [
+                            # Strategy 1: Handle malformed CSV with nested quotes
+                            {
+                                'encoding': encoding,
+                                'sep': sep,
+                                'low_memory': False,
+                                'quoting': 1,  # QUOTE_ALL
+                                'doublequote': True,
+                                'skipinitialspace': True
+                            },
+                            # Strategy 2: Standard reading
+                            {
+                                'encoding': encoding,
+                                'sep': sep,
+                                'low_memory': False,
+                                'quotechar': '"',
+                                'skipinitialspace': True
+                            },
+                            # Strategy 3: No quote handling
+                            {
+                                'encoding': encoding,
+                                'sep': sep,
+                                'low_memory': False,
+                                'quoting': 3  # QUOTE_NONE
+                            },
+                            # Strategy 4: Alternative quote character
+                            {
+                                'encoding': encoding,
+                                'sep': sep,
+                                'low_memory': False,
+                                'quotechar': "'",
+                                'skipinitialspace': True
+                            }
+                        ]
+
+                        for strategy_idx, params in enumerate(reading_strategies):
+                            try:
+                                self.data = pd.read_csv(file_path, nrows=max_rows, **params)
+                                if self.data.shape[1] > 1:  # Valid if has more than 1 column
+                                    strategy_name = f"estratégia {strategy_idx + 1}"
+                                    print(f"✅ Arquivo carregado com encoding '{encoding}', separador '{sep}' ({strategy_name})")
+                                    break
+                            except Exception as e:
+                                load_error = e
+                                continue
 
+                        if self.data is not None and self.data.shape[1] > 1:
+                            break
                     if self.data is not None and self.data.shape[1] > 1:
                         break
-                if self.data is not None and self.data.shape[1] > 1:
-                    break
 
             # If still only 1 column, try to fix malformed CSV
             if self.data is not None and self.data.shape[1] == 1:
-                self.data = self._fix_malformed_csv(file_path)
+                self.data = self._fix_malformed_csv(file_path, max_rows)
 
             if self.data is None or self.data.shape[1] <= 1:
                 raise Exception(f"Não foi possível carregar o arquivo. Último erro: {load_error}")
@@ -270,6 +616,9 @@ class EDAAgent:
             # Apply general preprocessing to any CSV file
             self.data = self._preprocess_csv_data(self.data)
 
+            if max_rows is None:
+                self._write_parquet_cache(file_path)
+
             # Initialize offline analyzer
             # offline_analyzer removido
 
@@ -282,12 +631,186 @@ class EDAAgent:
             print("   - Verifique se o caminho está correto")
             return False
 
-    def _fix_malformed_csv(self, file_path: str) -> pd.DataFrame:
+    def _parquet_cache_signature(self, file_path: str) -> Dict[str, Any]:
+        """Source file fingerprint stored next to the Parquet cache"""
+        stat = os.stat(file_path)
+        return {'version': PARQUET_CACHE_VERSION, 'mtime': stat.st_mtime, 'size': stat.st_size}
+
+    def _load_parquet_cache(self, file_path: str) -> bool:
+        """
+        Load the cleaned data from the Parquet sidecar if it matches the CSV
+
+        Args:
+            file_path (str): Path to CSV file
+
+        Returns:
+            bool: True if the cache was valid and loaded, False otherwise
+        """
+        if pa is None:
+            return False
+        try:
+            with open(f"{file_path}.parquet.meta.json", encoding='utf-8') as f:
+                if json.load(f) != self._parquet_cache_signature(file_path):
+                    return False
+            self.data = pd.read_parquet(f"{file_path}.parquet")
+        except Exception:
+            return False  # no cache, stale or unreadable: parse the CSV
+
+        self.filename = file_path.split('\\')[-1] if '\\' in file_path else file_path.split('/')[-1]
+        print(f"✅ Dados carregados do cache Parquet: {self.data.shape[0]} linhas, {self.data.shape[1]} colunas")
+        return True
+
+    def _write_parquet_cache(self, file_path: str) -> None:
+        """Persist the cleaned data as a Parquet sidecar (best effort)"""
+        if pa is None:
+            return
+        try:
+            signature = self._parquet_cache_signature(file_path)
+            self.data.to_parquet(f"{file_path}.parquet", compression='zstd')
+            # Metadata last: a cache without it is never used
+            with open(f"{file_path}.parquet.meta.json", 'w', encoding='utf-8') as f:
+                json.dump(signature, f)
+        except Exception as e:
+            print(f"⚠️ Cache Parquet não gravado: {e}")
+
+    def _read_csv_sniffed(self, file_path: str, max_rows: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """
+        Read the CSV in a single pass, sniffing encoding and separator from a sample
+
+        Args:
+            file_path (str): Path to CSV file
+            max_rows (Optional[int]): Stop after this many rows (None reads all)
+
+        Returns:
+            Optional[pd.DataFrame]: Loaded data, or None if the read failed
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                sample = f.read(SNIFF_SAMPLE_BYTES)
+
+            # Encoding: keep utf-8 if the sample decodes cleanly, else ask chardet
+            try:
+                codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+                encoding = 'utf-8'
+            except UnicodeDecodeError:
+                encoding = chardet.detect(sample)['encoding'] or 'latin-1'
+
+            # Separator: csv.Sniffer restricted to the separators we support
+            text = sample.decode(encoding, errors='replace')
+            try:
+                sep = csv.Sniffer().sniff(text, delimiters=',;\t').delimiter
+            except csv.Error:
+                sep = ','
+
+            # "a, b, c": only the C engine skips the space after the separator
+            # (pyarrow keeps it inside the values)
+            skip_space = f"{sep} " in _QUOTED_FIELD_RE.sub('', text)
+
+            # Row estimate from the sample's average line length
+            line_bytes = len(sample) / max(sample.count(b'\n'), 1)
+            estimated_rows = os.path.getsize(file_path) / line_bytes
+
+            if max_rows is not None and estimated_rows >= CHUNKED_READ_MIN_ROWS:
+                data = self._read_csv_head(file_path, sep, encoding, max_rows, skip_space)
+            else:
+                data = None
+                if not skip_space:
+                    try:
+                        data = pd.read_csv(file_path, sep=sep, encoding=encoding, engine='pyarrow')
+                    except Exception:
+                        pass  # pyarrow unavailable or rejected the file: C engine
+                if data is None:
+                    data = pd.read_csv(
+                        file_path, sep=sep, encoding=encoding, low_memory=False,
+                        cache_dates=True, skipinitialspace=skip_space
+                    )
+                if max_rows is not None:
+                    data = data.head(max_rows)
+
+            if data.shape[1] > 1:
+                print(f"✅ Arquivo carregado com encoding '{encoding}', separador '{sep}'")
+            return data
+        except Exception:
+            return None
+
+    def _read_csv_head(self, file_path: str, sep: str, encoding: str, max_rows: int,
+                       skip_space: bool = False) -> pd.DataFrame:
+        """
+        Read at most max_rows rows of a large CSV, streaming it in chunks
+
+        Args:
+            file_path (str): Path to CSV file
+            sep (str): Field separator
+            encoding (str): File encoding
+            max_rows (int): Row limit
+            skip_space (bool): Skip spaces after the separator (C engine only)
+
+        Returns:
+            pd.DataFrame: First max_rows rows of the file
+        """
+        if pa_csv is not None and not skip_space:
+            try:
+                return self._stream_csv_arrow(file_path, sep, encoding, max_rows)
+            except Exception:
+                pass  # types inferred from the first block did not fit later ones
+
+        # C engine chunks; round_trip parsing gives the same floats as pyarrow
+        chunks = []
+        n_rows = 0
+        with pd.read_csv(
+            file_path, sep=sep, encoding=encoding, chunksize=READ_CHUNK_ROWS,
+            low_memory=False, cache_dates=True, float_precision='round_trip',
+            skipinitialspace=skip_space,
+        ) as reader:
+            for chunk in reader:
+                chunks.append(chunk)
+                n_rows += len(chunk)
+                if n_rows >= max_rows:
+                    break
+        return pd.concat(chunks, ignore_index=True).head(max_rows)
+
+    def _stream_csv_arrow(self, file_path: str, sep: str, encoding: str,
+                          max_rows: int) -> pd.DataFrame:
+        """
+        Read record batches with pyarrow's streaming reader until max_rows is reached
+
+        Args:
+            file_path (str): Path to CSV file
+            sep (str): Field separator
+            encoding (str): File encoding
+            max_rows (int): Row limit
+
+        Returns:
+            pd.DataFrame: First max_rows rows of the file
+        """
+        batches = []
+        n_rows = 0
+        with pa_csv.open_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(encoding=encoding),
+            parse_options=pa_csv.ParseOptions(delimiter=sep),
+        ) as reader:
+            for batch in reader:
+                batches.append(batch)
+                n_rows += batch.num_rows
+                if n_rows >= max_rows:
+                    break
+            table = pa.Table.from_batches(batches, schema=reader.schema).slice(0, max_rows)
+
+        data = table.to_pandas()
+        # All-empty columns come back as object; read_csv gives float64 NaN
+        null_cols = [field.name for field in table.schema if pa.types.is_null(field.type)]
+        if null_cols:
+            data[null_cols] = data[null_cols].astype(np.float64)
+        return data
+
+    def _fix_malformed_csv(self, file_path: str, max_rows: Optional[int] = None) -> pd.DataFrame:
         """
         Fix malformed CSV files with nested quotes
 
         Args:
             file_path (str): Path to the malformed CSV file
+            max_rows (Optional[int]): Keep only the first max_rows rows (None keeps all)
 
         Returns:
             pd.DataFrame: Fixed data
@@ -295,62 +818,31 @@ class EDAAgent:
         print("🔧 Corrigindo formato CSV mal formado...")
 
         try:
-            # Read the raw file and fix the format
+            # Fix the whole file text at once; the per-line work runs inside re
             with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            fixed_lines = []
-            for line in lines:
-                # Fix the malformed header and data
-                if line.startswith('"Time,'):
-                    # Fix header line: "Time,""V1"",""V2""... to Time,V1,V2...
-                    fixed_line = line.strip().strip('"')  # Remove outer quotes
-                    fixed_line = fixed_line.replace('""', '"')  # Fix double quotes
-                    fixed_line = fixed_line.replace('","', ',').replace('",', ',').replace(',"', ',')
-                    fixed_line = fixed_line.replace('"', '')  # Remove all remaining quotes
-                    fixed_lines.append(fixed_line + '\n')
-                else:
-                    # Fix data lines
-                    line = line.strip()
-                    if '""' in line:
-                        # Handle lines with pattern: value,""value"",""value""...
-                        parts = []
-                        in_quotes = False
-                        current_part = ""
-                        i = 0
-                        while i < len(line):
-                            if line[i:i+2] == '""':
-                                if current_part:
-                                    parts.append(current_part)
-                                    current_part = ""
-                                i += 2
-                                continue
-                            elif line[i] == '"':
-                                i += 1
-                                continue
-                            elif line[i] == ',':
-                                if current_part:
-                                    parts.append(current_part)
-                                    current_part = ""
-                                i += 1
-                                continue
-                            current_part += line[i]
-                            i += 1
-
-                        if current_part:
-                            parts.append(current_part)
+                fixed_content = f.read()
 
-                        fixed_lines.append(','.join(parts) + '\n')
-                    else:
-                        fixed_lines.append(line + '\n')
-
-            # Create a temporary file-like object from fixed content
-            from io import StringIO
-            fixed_content = ''.join(fixed_lines)
-            fixed_file = StringIO(fixed_content)
+            # Header "Time,""V1"",""V2""... -> Time,V1,V2...
+            fixed_content = _MALFORMED_HEADER_RE.sub(
+                lambda m: m.group(0).strip().replace('"', ''), fixed_content
+            )
+            if (_fix_quoted_lines_jit is not None and len(fixed_content) >= FIX_JIT_MIN_BYTES
+                    and fixed_content.isascii()):
+                # Large ASCII files: both line passes in one compiled byte scan
+                buf = np.frombuffer(fixed_content.encode('ascii'), dtype=np.uint8)
+                out = np.empty_like(buf)
+                written = _fix_quoted_lines_jit(buf, out)
+                fixed_content = out[:written].tobytes().decode('ascii')
+            else:
+                fixed_content = _LINE_EDGE_SPACE_RE.sub('', fixed_content)
+                # Data lines value,""value"",""value""... -> value,value,value
+                fixed_content = _DOUBLED_QUOTE_LINE_RE.sub(_fix_doubled_quote_line, fixed_content)
+            if fixed_content and not fixed_content.endswith('\n'):
+                fixed_content += '\n'
+            fixed_file = io.StringIO(fixed_content)
 
             # Read the fixed CSV
-            fixed_data = pd.read_csv(fixed_file)
+            fixed_data = pd.read_csv(fixed_file, nrows=max_rows)
             print(f"   ✓ CSV corrigido: {fixed_data.shape[1]} colunas")
 
             return fixed_data
@@ -364,68 +856,47 @@ class EDAAgent:
         Clean problematic quotes from CSV data that can interfere with processing
 
         Args:
-            data (pd.DataFrame): Raw data with potential quote issues
+            data (pd.DataFrame): Raw data with potential quote issues (modified in place)
 
         Returns:
             pd.DataFrame: Data with quotes cleaned
         """
         print("🧹 Limpando aspas...")
 
-        cleaned_data = data.copy()
+        # No copy: load_data hands over a freshly read frame it does not reuse
+        cleaned_data = data
 
         # Clean column names
         cleaned_data.columns = [col.strip().strip('"').strip("'") for col in cleaned_data.columns]
 
-        # 2. Clean data values in object columns
-        object_cols = cleaned_data.select_dtypes(include=['object']).columns
-        cleaned_values_count = 0
-
-        for col in object_cols:
-            # Check if column has problematic quotes
-            sample_values = cleaned_data[col].astype(str).head(10)
-            has_quotes = any('"' in str(val) for val in sample_values)
-
-            if has_quotes:
-                try:
-                    # Clean quotes from the entire column
-                    original_series = cleaned_data[col].astype(str)
-
-                    # Remove leading/trailing quotes and clean internal quotes
-                    cleaned_series = original_series.str.strip()
-                    cleaned_series = cleaned_series.str.strip('"').str.strip("'")
+        # 2. Clean data values in text columns that show quotes in their first rows
+        # ('string' also selects pandas' str dtype, the default for text in pandas 3)
+        object_cols = cleaned_data.select_dtypes(include=['object', 'string']).columns
+        sample = cleaned_data[object_cols].head(10).astype(str)
+        quoted_cols = [
+            col for col in object_cols
+            if sample[col].str.contains('"', regex=False).any()
+        ]
 
-                    # Handle double quotes that might be escaped
-                    cleaned_series = cleaned_series.str.replace('""', '"')
-                    cleaned_series = cleaned_series.str.replace("''", "'")
+        if quoted_cols:
+            # Strip whitespace/outer quotes and collapse "" and '' (plain string
+            # ops stay in the vectorized kernels; a regex here is much slower)
+            cleaned = cleaned_data[quoted_cols].apply(_strip_quotes)
 
-                    # Convert back to original type if it was numeric
-                    try:
-                        # Test if the cleaned version can be numeric
-                        numeric_test = pd.to_numeric(cleaned_series, errors='coerce')
-                        if numeric_test.notna().sum() / len(numeric_test) > 0.8:
-                            cleaned_data[col] = numeric_test
-                            cleaned_values_count += 1
-                        else:
-                            cleaned_data[col] = cleaned_series
-                            cleaned_values_count += 1
-                    except:
-                        cleaned_data[col] = cleaned_series
-                        cleaned_values_count += 1
+            # Keep numeric if the cleaned version converts for most values
+            numeric = cleaned.apply(pd.to_numeric, errors='coerce')
+            is_numeric = numeric.notna().mean() > 0.8
+            for col in quoted_cols:
+                cleaned_data[col] = numeric[col] if is_numeric[col] else cleaned[col]
 
-                except:
-                    pass
+            print(f"   ✓ {len(quoted_cols)} colunas processadas")
 
-        if cleaned_values_count > 0:
-            print(f"   ✓ {cleaned_values_count} colunas processadas")
-
-        # Additional cleaning
-        for col in cleaned_data.columns:
-            if cleaned_data[col].dtype == 'object':
-                try:
-                    cleaned_data[col] = cleaned_data[col].astype(str).str.replace('\ufeff', '').str.strip()
-                    cleaned_data[col] = cleaned_data[col].replace(['nan', 'NaN', 'NULL', 'null', ''], pd.NA)
-                except:
-                    pass
+        # Additional cleaning: BOM, surrounding whitespace and null markers
+        text_cols = list(cleaned_data.select_dtypes(include=['object', 'string']).columns)
+        if text_cols:
+            cleaned_data[text_cols] = cleaned_data[text_cols].apply(
+                _strip_bom_whitespace
+            ).replace(['nan', 'NaN', 'NULL', 'null', ''], pd.NA)
 
         print("✅ Aspas limpas!")
         print()
@@ -437,15 +908,15 @@ class EDAAgent:
         Preprocess the teste.csv file with specific treatments for fraud detection data
 
         Args:
-            data (pd.DataFrame): Raw data from teste.csv
+            data (pd.DataFrame): Raw data from teste.csv (modified in place)
 
         Returns:
             pd.DataFrame: Preprocessed data
         """
         print("📋 Aplicando tratamentos específicos para dados de fraude...")
 
-        # Create a copy to avoid modifying original
-        processed_data = data.copy()
+        # No copy: the raw frame is not needed after preprocessing
+        processed_data = data
 
         # 1. Ensure proper column names and types
         expected_columns = ['Time'] + [f'V{i}' for i in range(1, 29)] + ['Amount', 'Class']
@@ -453,7 +924,12 @@ class EDAAgent:
         # 2. Convert Class to categorical with proper labels
         if 'Class' in processed_data.columns:
             processed_data['Class'] = processed_data['Class'].astype(int)
-            processed_data['Class_Label'] = processed_data['Class'].map({0: 'Normal', 1: 'Fraudulenta'})
+            # Class 0/1 are already the category codes (any other value -> NaN)
+            class_codes = processed_data['Class'].to_numpy()
+            processed_data['Class_Label'] = pd.Categorical.from_codes(
+                np.where((class_codes == 0) | (class_codes == 1), class_codes, -1),
+                categories=['Normal', 'Fraudulenta']
+            )
             print(f"   ✓ Classes identificadas: {processed_data['Class'].value_counts().to_dict()}")
 
         # 3. Ensure Time is properly formatted
@@ -470,13 +946,23 @@ class EDAAgent:
         pca_columns = [col for col in processed_data.columns if col.startswith('V') and col[1:].isdigit()]
         for col in pca_columns:
             processed_data[col] = pd.to_numeric(processed_data[col], errors='coerce')
+        # float32 is plenty for PCA components and halves the memory scanned
+        processed_data[pca_columns] = processed_data[pca_columns].astype(np.float32)
 
         print(f"   ✓ {len(pca_columns)} componentes PCA processadas")
 
         # 6. Create additional derived features for fraud analysis
         if 'Amount' in processed_data.columns and 'Time' in processed_data.columns:
             # Hour of day (assuming Time is seconds from start)
-            processed_data['Hour'] = ((processed_data['Time'] / 3600) % 24).astype(int)
+            # floor(t / 3600) mod 24 in integers: one float temporary, floor in place,
+            # integer modulo (cheaper than float fmod); int8 holds 0-23
+            hours = processed_data['Time'].to_numpy(dtype=np.float64) / 3600
+            if not np.isfinite(hours).all():
+                raise ValueError("Cannot convert non-finite values (NA or inf) to integer")
+            np.floor(hours, out=hours)
+            hour_of_day = hours.astype(np.int64)
+            hour_of_day %= 24
+            processed_data['Hour'] = hour_of_day.astype(np.int8)
 
             # Amount categories
             processed_data['Amount_Category'] = pd.cut(
@@ -509,67 +995,65 @@ class EDAAgent:
         General preprocessing for any CSV file
 
         Args:
-            data (pd.DataFrame): Raw CSV data
+            data (pd.DataFrame): Raw CSV data (modified in place)
 
         Returns:
             pd.DataFrame: Preprocessed data
         """
         print("📋 Processando dados...")
 
-        processed_data = data.copy()
+        # No copy: load_data hands over the cleaned frame it does not reuse
+        processed_data = data
 
         # Clean column names
         processed_data.columns = processed_data.columns.str.strip().str.replace('"', '')
 
-        # 2. Detect and convert numeric columns
-        numeric_converted = 0
+        # 2. Detect and convert numeric columns in a single pass: object columns
+        # that mostly parse as numbers, plus the expected numeric columns (forced)
+        expected_numeric_cols = {'Time', 'Amount'} | {f'V{i}' for i in range(1, 29)}
+        total_converted = 0
         for col in processed_data.columns:
-            if processed_data[col].dtype == 'object':
-                # Try to convert to numeric
-                try:
-                    # Remove common non-numeric characters and quotes
-                    cleaned_series = processed_data[col].astype(str)
-                    cleaned_series = cleaned_series.str.replace('"', '')  # Remove quotes
-                    cleaned_series = cleaned_series.str.replace(',', '.')  # Handle decimal separator
-                    cleaned_series = cleaned_series.str.replace(r'[^\d.-]', '', regex=True)
-
-                    # Handle empty strings
-                    cleaned_series = cleaned_series.replace('', '0')
-
-                    numeric_series = pd.to_numeric(cleaned_series, errors='coerce')
-
-                    # If most values are successfully converted, use numeric
-                    successful_conversion_rate = numeric_series.notna().sum() / len(numeric_series)
-                    if successful_conversion_rate > 0.8:
-                        processed_data[col] = numeric_series
-                        numeric_converted += 1
-                except:
-                    pass
+            if processed_data[col].dtype != 'object':
+                continue
 
-        # Force conversion for expected numeric columns
-        expected_numeric_cols = ['Time', 'Amount'] + [f'V{i}' for i in range(1, 29)]
-        forced_conversions = 0
-        for col in expected_numeric_cols:
-            if col in processed_data.columns and processed_data[col].dtype == 'object':
-                try:
-                    cleaned_series = processed_data[col].astype(str).str.replace('"', '').str.replace(',', '.')
-                    cleaned_series = cleaned_series.str.replace(r'[^\d.-]', '', regex=True).replace('', '0')
-                    processed_data[col] = pd.to_numeric(cleaned_series, errors='coerce')
-                    forced_conversions += 1
-                except:
-                    pass
+            # Decimal comma -> dot, drop quotes and other non-numeric characters
+            cleaned_series = processed_data[col].astype(str).str.replace(',', '.', regex=False)
+            cleaned_series = cleaned_series.str.replace(r'[^\d.-]', '', regex=True).replace('', '0')
+            numeric_series = pd.to_numeric(cleaned_series, errors='coerce')
+
+            # If most values are successfully converted (or the column is expected
+            # to be numeric), use numeric
+            if col in expected_numeric_cols or numeric_series.notna().mean() > 0.8:
+                processed_data[col] = numeric_series
+                total_converted += 1
 
-        total_converted = numeric_converted + forced_conversions
         if total_converted > 0:
             print(f"   ✓ {total_converted} colunas convertidas para numéricas")
 
-        # Handle missing values and cleanup
-        missing_total = processed_data.isnull().sum().sum()
+        # Handle missing values and cleanup (one null mask for all three checks)
+        null_mask = processed_data.isnull()
+        missing_total = int(null_mask.values.sum())
         if missing_total > 0:
             print(f"   ⚠️ {missing_total} valores faltantes")
 
         # Remove empty rows/columns
-        processed_data = processed_data.dropna(how='all').loc[:, ~processed_data.isnull().all()]
+        processed_data = processed_data.loc[~null_mask.all(axis=1), ~null_mask.all()]
+
+        # Downcast: only bounded integer columns (Class 0/1, Hour 0-23) to the
+        # smallest lossless type; other integers stay int64 so arithmetic in
+        # generated code cannot overflow. PCA components go to float32
+        int_cols = [
+            col for col in ('Class', 'Hour')
+            if col in processed_data.columns and pd.api.types.is_integer_dtype(processed_data[col])
+        ]
+        if int_cols:
+            processed_data[int_cols] = processed_data[int_cols].apply(pd.to_numeric, downcast='integer')
+        pca_cols = [
+            col for col in processed_data.columns
+            if re.fullmatch(r'V\d+', str(col)) and pd.api.types.is_float_dtype(processed_data[col])
+        ]
+        if pca_cols:
+            processed_data[pca_cols] = processed_data[pca_cols].astype(np.float32)
 
         # Final summary
         numeric_cols = processed_data.select_dtypes(include=[np.number]).columns
@@ -578,7 +1062,7 @@ class EDAAgent:
         print(f"   📊 {len(numeric_cols)} numéricas, {len(categorical_cols)} categóricas, {len(processed_data)} registros")
 
         # Handle Class column for classification (don't add new column, just detect)
-        if 'Class' in processed_data.columns and processed_data['Class'].dtype in ['int64', 'float64']:
+        if 'Class' in processed_data.columns and pd.api.types.is_numeric_dtype(processed_data['Class']):
             unique_classes = processed_data['Class'].unique()
             if len(unique_classes) <= 10:
                 print(f"   🎯 Alvo de classificação detectado: {unique_classes}")
@@ -588,6 +1072,37 @@ class EDAAgent:
 
         return processed_data
 
+    def _get_schema(self) -> Dict[str, Any]:
+        """
+        Schema strings and column groups of the loaded data, computed once per dataset
+
+        Rebuilt when self.data is replaced; load_data/load_dataframe and the
+        code execution tool (which can change data in place) reset it.
+
+        Returns:
+            Dict[str, Any]: shape, columns, dtypes (string and dict), missing
+            values string, numeric and categorical column indexes, and the
+            dataset part of the code generation prompt
+        """
+        cache = getattr(self, '_schema_cache', None)
+        if cache is None or cache['data'] is not self.data:
+            cache = self._schema_cache = {
+                'data': self.data,
+                'shape': self.data.shape,
+                'columns': list(self.data.columns),
+                'dtypes_str': self.data.dtypes.to_string(),
+                'dtypes_dict': dict(self.data.dtypes),
+                'missing_str': self.data.isnull().sum().to_string(),
+                'numeric_cols': self.data.select_dtypes(include=[np.number]).columns,
+                'categorical_cols': self.data.select_dtypes(include=['object', 'category']).columns,
+            }
+            cache['code_gen_prompt'] = _CODE_GEN_PROMPT.format(
+                rows=cache['shape'][0],
+                cols=cache['shape'][1],
+                columns=', '.join(f"{col} ({dtype})" for col, dtype in cache['dtypes_dict'].items()),
+            )
+        return cache
+
     def _create_tools(self) -> List[Tool]:
         """Create analysis tools for the agent"""
 
@@ -597,12 +1112,13 @@ class EDAAgent:
             if self.data is None:
                 return "No data loaded. Please load a CSV file first."
 
+            schema = self._get_schema()
             info = []
             info.append(f"Dataset: {self.filename}")
-            info.append(f"Shape: {self.data.shape[0]} rows, {self.data.shape[1]} columns")
-            info.append(f"Columns: {list(self.data.columns)}")
-            info.append(f"Data types:\n{self.data.dtypes.to_string()}")
-            info.append(f"Missing values:\n{self.data.isnull().sum().to_string()}")
+            info.append(f"Shape: {schema['shape'][0]} rows, {schema['shape'][1]} columns")
+            info.append(f"Columns: {schema['columns']}")
+            info.append(f"Data types:\n{schema['dtypes_str']}")
+            info.append(f"Missing values:\n{schema['missing_str']}")
 
             return "\n\n".join(info)
 
@@ -612,7 +1128,7 @@ class EDAAgent:
             if self.data is None:
                 return "No data loaded. Please load a CSV file first."
 
-            numeric_cols = self.data.select_dtypes(include=[np.number]).columns
+            numeric_cols = self._get_schema()['numeric_cols']
             if len(numeric_cols) == 0:
                 return "No numerical columns found in the dataset."
 
@@ -625,11 +1141,17 @@ class EDAAgent:
             if self.data is None:
                 return "No data loaded. Please load a CSV file first."
 
-            numeric_cols = self.data.select_dtypes(include=[np.number]).columns
+            numeric_cols = self._get_schema()['numeric_cols']
             if len(numeric_cols) < 2:
                 return "Need at least 2 numerical columns to calculate correlations."
 
-            corr_matrix = self.data[numeric_cols].corr()
+            data = self.data[numeric_cols]
+            arr = data.to_numpy(dtype=np.float64)
+            if np.isnan(arr).any():
+                # Pairwise-complete semantics for missing values: keep pandas
+                corr_matrix = data.corr()
+            else:
+                corr_matrix = pd.DataFrame(_pearson_corr(arr), index=numeric_cols, columns=numeric_cols)
             return f"Correlation Matrix:\n{corr_matrix.to_string()}"
 
         @tool
@@ -638,28 +1160,39 @@ class EDAAgent:
             if self.data is None:
                 return "No data loaded. Please load a CSV file first."
 
-            numeric_cols = self.data.select_dtypes(include=[np.number]).columns
+            numeric_cols = self._get_schema()['numeric_cols']
 
             if column and column not in numeric_cols:
                 return f"Column '{column}' not found or not numerical."
 
-            cols_to_check = [column] if column else numeric_cols
-            outlier_info = []
+            cols_to_check = [column] if column else list(numeric_cols)
+            data = self.data[cols_to_check]
 
-            for col in cols_to_check:
-                Q1 = self.data[col].quantile(0.25)
-                Q3 = self.data[col].quantile(0.75)
+            if (_iqr_outliers_jit is not None and get_num_threads() > 1
+                    and data.size >= JIT_MIN_CELLS and len(cols_to_check) > 1):
+                # Large frames: compiled kernel, columns selected in parallel
+                lower, upper, counts = _iqr_outliers_jit(np.asfortranarray(data.to_numpy(dtype=np.float64)))
+                lower_bounds = pd.Series(lower, index=cols_to_check)
+                upper_bounds = pd.Series(upper, index=cols_to_check)
+                outlier_counts = pd.Series(counts, index=cols_to_check)
+            else:
+                # Quartiles, bounds and outlier counts for all columns at once
+                quartiles = data.quantile([0.25, 0.75])
+                Q1, Q3 = quartiles.loc[0.25], quartiles.loc[0.75]
                 IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-
-                outliers = self.data[(self.data[col] < lower_bound) | (self.data[col] > upper_bound)]
-                outlier_count = len(outliers)
+                lower_bounds = Q1 - 1.5 * IQR
+                upper_bounds = Q3 + 1.5 * IQR
+                outlier_counts = (data.lt(lower_bounds) | data.gt(upper_bounds)).sum()
 
+            outlier_info = []
+            for col in cols_to_check:
+                outlier_count = int(outlier_counts[col])
                 outlier_info.append(f"Column '{col}': {outlier_count} outliers detected")
                 if outlier_count > 0:
-                    outlier_info.append(f"  Range: {lower_bound:.2f} to {upper_bound:.2f}")
-                    outlier_info.append(f"  Outlier values sample: {outliers[col].head().tolist()}")
+                    values = data[col]
+                    outliers = values[(values < lower_bounds[col]) | (values > upper_bounds[col])]
+                    outlier_info.append(f"  Range: {lower_bounds[col]:.2f} to {upper_bounds[col]:.2f}")
+                    outlier_info.append(f"  Outlier values sample: {outliers.head().tolist()}")
 
             return "\n".join(outlier_info)
 
@@ -669,7 +1202,7 @@ class EDAAgent:
             if self.data is None:
                 return "No data loaded. Please load a CSV file first."
 
-            categorical_cols = self.data.select_dtypes(include=['object', 'category']).columns
+            categorical_cols = self._get_schema()['categorical_cols']
 
             if len(categorical_cols) == 0:
                 return "No categorical columns found in the dataset."
@@ -719,56 +1252,12 @@ class EDAAgent:
             print(f"🔍 Debug: data shape = {self.data.shape}, variáveis passadas = {list(local_vars.keys())}")
 
             # Ask the LLM to generate Python code for the specific question
-            code_generation_prompt = f"""
-            Você tem um dataset pandas chamado 'data' carregado. O usuário fez a seguinte pergunta:
-            "{question}"
-
-            Gere código Python que responda especificamente a esta pergunta. O código deve:
-            1. Analisar os dados relevantes e fazer cálculos necessários
-            2. Imprimir resultados claros e informativos usando print()
-            3. Gerar gráficos relevantes quando apropriado usando matplotlib/seaborn
-            4. Salvar gráficos como PNG na pasta charts/ se criados
-            5. Tirar conclusões baseadas nos dados analisados
-
-            VARIÁVEIS DISPONÍVEIS:
-            - data: DataFrame principal com os dados ({self.data.shape[0]} linhas, {self.data.shape[1]} colunas)
-            - pd: pandas
-            - np: numpy
-            - plt: matplotlib.pyplot
-            - sns: seaborn
-            - os: os module
-            - timestamp: string única para nomes de arquivo
-
-            Dataset info:
-            - Shape: {self.data.shape}
-            - Columns: {list(self.data.columns)}
-            - Data types: {dict(self.data.dtypes)}
-
-            EXEMPLO DE CÓDIGO VÁLIDO:
-            ```python
-            # Verificar se data está carregado
-            print(f"Dataset shape: {{data.shape}}")
-            print(f"Columns: {{list(data.columns)}}")
-
-            # Gerar análise
-            numeric_cols = data.select_dtypes(include=[np.number]).columns
-            for col in numeric_cols[:3]:  # Primeiras 3 colunas
-                plt.figure(figsize=(10, 6))
-                data[col].hist(bins=30)
-                plt.title(f'Distribuição de {{col}}')
-                plt.tight_layout()
-                plt.savefig(f'charts/{{timestamp}}_hist_{{col}}.png', dpi=300, bbox_inches='tight')
-                plt.close()
-                print(f"Gráfico salvo: charts/{{timestamp}}_hist_{{col}}.png")
-            ```
-
-            IMPORTANTE:
-            - Use SEMPRE 'data' como nome do DataFrame
-            - SEMPRE feche figuras com plt.close()
-            - Use timestamp para nomes únicos de arquivo
-
-            Retorne APENAS o código Python, sem explicações adicionais.
-            """
+            # (dataset part of the prompt is built once per dataset, question goes last)
+            code_generation_prompt = (
+                f"{self._get_schema()['code_gen_prompt']}\n"
+                f'Pergunta do usuário: "{question}"\n\n'
+                "Retorne APENAS o código Python, sem explicações adicionais."
+            )
 
             try:
                 # Generate code using the LLM
@@ -788,8 +1277,12 @@ class EDAAgent:
                 error_buffer = io.StringIO()
 
                 # Execute the generated code
-                with redirect_stdout(output_buffer), redirect_stderr(error_buffer):
-                    exec(generated_code, {"__builtins__": __builtins__}, local_vars)
+                try:
+                    with redirect_stdout(output_buffer), redirect_stderr(error_buffer):
+                        exec(generated_code, {"__builtins__": __builtins__}, local_vars)
+                finally:
+                    # The code gets self.data itself and may have changed it in place
+                    self._schema_cache = None
 
                 output = output_buffer.getvalue()
                 errors = error_buffer.getvalue()
@@ -1740,6 +2233,7 @@ print(f"Dataset pronto para análise com {{len(numeric_cols)}} vars numéricas e
         try:
             self.data = dataframe.copy()
             self.filename = filename
+            self._schema_cache = None
 
             # Initialize offline analyzer
             # offline_analyzer removido
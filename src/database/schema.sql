@@ -228,6 +228,8 @@ CREATE INDEX IF NOT EXISTS idx_legal_refs_code ON legal_refs(code);
 CREATE INDEX IF NOT EXISTS idx_legal_refs_type ON legal_refs(ref_type);
 CREATE INDEX IF NOT EXISTS idx_legal_refs_scope ON legal_refs(scope);
 CREATE INDEX IF NOT EXISTS idx_legal_refs_effective ON legal_refs(effective_date);
+-- Cobre o resumo por escopo/tipo (SELECT scope, ref_type) sem ler a tabela
+CREATE INDEX IF NOT EXISTS idx_legal_refs_scope_type ON legal_refs(scope, ref_type);
 
 -- =====================================================
 -- 6. Validation Log (Auditoria - opcional para MVP)
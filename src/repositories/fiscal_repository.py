@@ -11,11 +11,18 @@ Métodos para consulta das regras de validação:
 """
 
 import sqlite3
+import subprocess
+import sys
 from typing import Optional, Dict, List, Any
 from pathlib import Path
 from datetime import date
 
 
+# Path padrão relativo ao projeto: rules.db é versionado já populado
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_DB_PATH = PROJECT_ROOT / "src" / "database" / "rules.db"
+
+
 class FiscalRepository:
     """
     Repositório de acesso às regras fiscais no SQLite
@@ -34,9 +41,7 @@ class FiscalRepository:
             use_ai_fallback: Habilitar consulta LLM como última camada (fallback)
         """
         if db_path is None:
-            # Path padrão relativo ao projeto
-            project_root = Path(__file__).parent.parent.parent
-            db_path = project_root / "src" / "database" / "rules.db"
+            db_path = DEFAULT_DB_PATH
 
         self.db_path = str(db_path)
         self.conn = None
@@ -58,13 +63,36 @@ class FiscalRepository:
 
     def _connect(self):
         """Conectar ao database"""
+        if not Path(self.db_path).exists():
+            self._build_database()
+
         try:
             # check_same_thread=False permite uso em múltiplas threads (Streamlit)
             self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
             self.conn.row_factory = sqlite3.Row  # Retornar dicts
+            # Repositório só lê: bloqueia escritas e lê as páginas via mmap
+            self.conn.execute("PRAGMA query_only=1")
+            self.conn.execute("PRAGMA mmap_size=268435456")
         except sqlite3.Error as e:
             raise ConnectionError(f"Erro ao conectar ao database: {e}")
 
+    def _build_database(self):
+        """Gerar o rules.db padrão com scripts/populate_db.py (só se ausente)"""
+        if Path(self.db_path).resolve() != DEFAULT_DB_PATH.resolve():
+            raise ConnectionError(f"Database não encontrado: {self.db_path}")
+
+        try:
+            subprocess.run(
+                [sys.executable, str(PROJECT_ROOT / "scripts" / "populate_db.py")],
+                check=True, stdout=subprocess.DEVNULL
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise ConnectionError(f"Erro ao gerar o database: {e}")
+
+        # Sem o arquivo, sqlite3.connect criaria um rules.db vazio
+        if not Path(self.db_path).exists():
+            raise ConnectionError(f"Database não gerado: {self.db_path}")
+
     def close(self):
         """Fechar conexão"""
         if self.conn:
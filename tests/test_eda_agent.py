@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for EDAAgent - Testes do carregamento de CSV do agente EDA
+
+Este módulo testa a leitura e a limpeza dos dados em load_data, sem
+inicializar o modelo de IA.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("langchain_google_genai")
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from agents import eda_agent as eda_module  # noqa: E402
+from agents.eda_agent import EDAAgent  # noqa: E402
+
+
+@pytest.fixture
+def agent():
+    """EDAAgent sem modelo: só o estado usado por load_data"""
+    eda_agent = EDAAgent.__new__(EDAAgent)
+    eda_agent.data = None
+    eda_agent.filename = None
+    return eda_agent
+
+
+class TestLoadData:
+    """Testes para EDAAgent.load_data"""
+
+    def test_space_after_separator_is_skipped(self, agent, tmp_path):
+        """CSV com ', ' entre campos: valores sem o espaço inicial"""
+        csv_path = tmp_path / 'espacos.csv'
+        csv_path.write_text('a, b, c\n1, x, 2.5\n2, y, 3.0\n3, x, 4.5\n', encoding='utf-8')
+
+        assert agent.load_data(str(csv_path))
+
+        assert list(agent.data.columns) == ['a', 'b', 'c']
+        assert agent.data['a'].tolist() == [1, 2, 3]
+        assert agent.data['b'].tolist() == ['x', 'y', 'x']
+        assert agent.data['c'].tolist() == [2.5, 3.0, 4.5]
+        assert agent.data['b'].value_counts()['x'] == 2
+
+    def test_text_columns_are_stripped(self, agent, tmp_path):
+        """Colunas de texto (object ou str) perdem espaços e marcadores nulos"""
+        csv_path = tmp_path / 'texto.csv'
+        csv_path.write_text('id;nome;v\n1;  alfa ;1.5\n2;;2.5\n3;NULL;3.5\n4;beta;4.5\n',
+                            encoding='utf-8')
+
+        assert agent.load_data(str(csv_path))
+
+        nomes = agent.data['nome']
+        assert nomes[0] == 'alfa' and nomes[3] == 'beta'
+        assert nomes[[1, 2]].isna().all()
+
+
+@pytest.fixture
+def fraud_csv(tmp_path):
+    """CSV no formato do dataset de fraude (Time, V1..V3, Amount, Class, texto)"""
+    rng = np.random.default_rng(42)
+    n = 200
+    data = pd.DataFrame({
+        'Time': np.arange(n, dtype=float),
+        'V1': rng.normal(size=n),
+        'V2': rng.normal(size=n),
+        'V3': rng.normal(size=n),
+        'Amount': rng.exponential(50, size=n).round(2),
+        'Class': rng.integers(0, 2, size=n),
+        'Loja': rng.choice(['a', 'b', 'c'], size=n),
+    })
+    data.loc[::17, 'Amount'] = np.nan
+    csv_path = tmp_path / 'fraude.csv'
+    data.to_csv(csv_path, index=False)
+    return csv_path
+
+
+def _sidecars(csv_path):
+    return Path(f"{csv_path}.parquet"), Path(f"{csv_path}.parquet.meta.json")
+
+
+@pytest.mark.skipif(eda_module.pa is None, reason="pyarrow não instalado")
+class TestParquetCache:
+    """Testes para o cache Parquet ao lado do CSV (_load/_write_parquet_cache)"""
+
+    def _load(self, csv_path, max_rows=None):
+        eda_agent = EDAAgent.__new__(EDAAgent)
+        eda_agent.data = None
+        eda_agent.filename = None
+        assert eda_agent.load_data(str(csv_path), max_rows=max_rows)
+        return eda_agent
+
+    def test_second_load_reads_cache(self, fraud_csv, monkeypatch):
+        """Segunda carga vem do Parquet e é idêntica à leitura do CSV"""
+        fresh = self._load(fraud_csv).data
+        assert all(path.exists() for path in _sidecars(fraud_csv))
+
+        # O CSV não pode ser lido de novo
+        def fail(*args, **kwargs):
+            raise AssertionError("CSV relido com cache válido")
+        monkeypatch.setattr(EDAAgent, '_read_csv_sniffed', fail)
+
+        cached = self._load(fraud_csv)
+        pd.testing.assert_frame_equal(cached.data, fresh)
+        assert cached.filename == 'fraude.csv'
+
+    def test_touched_csv_invalidates_cache(self, fraud_csv):
+        """Mudança de mtime ou de tamanho do CSV torna o cache obsoleto"""
+        self._load(fraud_csv)
+        stat = fraud_csv.stat()
+        os.utime(fraud_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert not EDAAgent.__new__(EDAAgent)._load_parquet_cache(str(fraud_csv))
+
+        # Recarga regrava o cache com a nova assinatura
+        self._load(fraud_csv)
+        assert EDAAgent.__new__(EDAAgent)._load_parquet_cache(str(fraud_csv))
+
+        with open(fraud_csv, 'a', encoding='utf-8') as f:
+            f.write('199.0,0.1,0.2,0.3,10.0,1,a\n')
+        os.utime(fraud_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert not EDAAgent.__new__(EDAAgent)._load_parquet_cache(str(fraud_csv))
+        assert len(self._load(fraud_csv).data) == 201
+
+    def test_cache_version_invalidates_cache(self, fraud_csv, monkeypatch):
+        """Incrementar PARQUET_CACHE_VERSION descarta caches gravados antes"""
+        self._load(fraud_csv)
+        monkeypatch.setattr(eda_module, 'PARQUET_CACHE_VERSION', eda_module.PARQUET_CACHE_VERSION + 1)
+        assert not EDAAgent.__new__(EDAAgent)._load_parquet_cache(str(fraud_csv))
+
+    def test_max_rows_skips_cache(self, fraud_csv, monkeypatch):
+        """Cargas com max_rows não gravam nem leem o cache"""
+        partial = self._load(fraud_csv, max_rows=50)
+        assert len(partial.data) == 50
+        assert not any(path.exists() for path in _sidecars(fraud_csv))
+
+        self._load(fraud_csv)
+        assert all(path.exists() for path in _sidecars(fraud_csv))
+
+        # Os erros do cache são engolidos: registrar as chamadas
+        calls = []
+        monkeypatch.setattr(pd, 'read_parquet', lambda *a, **k: calls.append('read'))
+        monkeypatch.setattr(pd.DataFrame, 'to_parquet', lambda *a, **k: calls.append('write'))
+        assert len(self._load(fraud_csv, max_rows=50).data) == 50
+        assert calls == []
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for modern_chat - Testes da integração de gráficos e do histórico do chat
+
+Este módulo testa a detecção de gráficos recentes em charts/ e a
+paginação do histórico persistido em ChatHistoryDB.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import modern_chat  # noqa: E402
+
+
+class _FakeAgent:
+    """Agente EDA mínimo: só responde à pergunta"""
+
+    def ask_question(self, query):
+        return f"resposta: {query}"
+
+
+class TestChartDetection:
+    """Testes para process_eda_query / _scan_chart_files"""
+
+    def test_overwritten_chart_is_sent_again(self, tmp_path, monkeypatch):
+        """Gráfico sobrescrito no lugar (nome fixo) volta a ser enviado"""
+        monkeypatch.chdir(tmp_path)
+        charts_dir = tmp_path / 'charts'
+        charts_dir.mkdir()
+        chart = charts_dir / 'outliers_boxplot.png'
+        chart.write_bytes(b'old')
+
+        # Gráfico antigo: fora da janela de 120s
+        old = time.time() - 1000
+        os.utime(chart, (old, old))
+        os.utime(charts_dir, (old, old))
+        result = modern_chat.process_eda_query("pergunta", _FakeAgent())
+        assert result["type"] == "text"
+
+        # Sobrescrever no lugar mantém o mtime do diretório
+        dir_mtime = charts_dir.stat().st_mtime_ns
+        chart.write_bytes(b'new')
+        os.utime(charts_dir, ns=(dir_mtime, dir_mtime))
+        assert charts_dir.stat().st_mtime_ns == dir_mtime
+
+        result = modern_chat.process_eda_query("pergunta", _FakeAgent())
+        assert result["type"] == "multi"
+        assert result["content"][1]["content"] == [Path('charts') / 'outliers_boxplot.png']
+
+
+@pytest.fixture
+def seeded_history(tmp_path, monkeypatch):
+    """ChatHistoryDB temporário com 120 mensagens numa sessão"""
+    db = modern_chat.ChatHistoryDB(str(tmp_path / 'chat_history.db'))
+    session_id = 'sessao-teste'
+    for i in range(120):
+        db.save_message(session_id, 'user', f'msg {i}')
+    monkeypatch.setattr(modern_chat, '_get_chat_db', lambda: db)
+    modern_chat._fetch_history.clear()
+    yield db, session_id
+    modern_chat._fetch_history.clear()
+    db.conn.close()
+
+
+@pytest.fixture
+def session_state(monkeypatch):
+    """session_state isolado (dict com acesso por atributo)"""
+    class _State(dict):
+        __getattr__ = dict.__getitem__
+        __setattr__ = dict.__setitem__
+
+    state = _State()
+    monkeypatch.setattr(modern_chat.st, 'session_state', state)
+    return state
+
+
+class TestHistoryPagination:
+    """Testes para a paginação do histórico (ChatHistoryDB / WhatsAppStyleChat)"""
+
+    def test_get_session_history_pages_backwards(self, seeded_history):
+        """Páginas por keyset em timestamp cobrem todo o histórico, sem repetição"""
+        db, session_id = seeded_history
+        contents = []
+        before = None
+        while True:
+            page = db.get_session_history(session_id, limit=50, before=before)
+            if not page:
+                break
+            contents[:0] = [row[4] for row in page]
+            before = page[0][2]
+
+        assert contents == [f'msg {i}' for i in range(120)]
+
+    def test_chat_loads_older_pages_until_exhausted(self, seeded_history, session_state):
+        """load_older_history prepende páginas e zera o cursor na última"""
+        _, session_id = seeded_history
+        chat = modern_chat.WhatsAppStyleChat(session_id)
+        assert len(session_state.messages) == modern_chat.HISTORY_PAGE_SIZE
+        assert session_state.history_cursor is not None
+
+        chat.load_older_history()
+        chat.load_older_history()
+        assert session_state.history_cursor is None
+        assert [m['content'] for m in session_state.messages] == [f'msg {i}' for i in range(120)]
+
+    def test_clear_button_resets_pagination(self, seeded_history, session_state, monkeypatch):
+        """Limpar conversa descarta cursor, janela e o cache das páginas"""
+        _, session_id = seeded_history
+        chat = modern_chat.WhatsAppStyleChat(session_id)
+        session_state.render_window = 2 * modern_chat.RENDER_WINDOW
+        cleared = []
+        monkeypatch.setattr(modern_chat.st.sidebar, 'button', lambda *a, **k: True)
+        monkeypatch.setattr(modern_chat.st, 'rerun', lambda: None)
+        monkeypatch.setattr(modern_chat._fetch_history, 'clear', lambda: cleared.append(True))
+
+        chat.render_clear_button()
+
+        assert session_state.messages == []
+        assert 'history_cursor' not in session_state
+        assert 'render_window' not in session_state
+        assert cleared
+
+
+class TestHistoryWriter:
+    """Testes para a gravação em lote do ChatHistoryDB"""
+
+    def test_bad_row_does_not_drop_batch(self, tmp_path, caplog):
+        """Linha inválida no lote: só ela é descartada, com id e sessão no log"""
+        db = modern_chat.ChatHistoryDB(str(tmp_path / 'chat_history.db'))
+        try:
+            good_1 = db._message_row('s1', 'user', 'ok 1', 'text', None)
+            bad = db._message_row('s2', 'user', 'ruim', 'text', '{json inválido')
+            good_2 = db._message_row('s1', 'assistant', 'ok 2', 'text', None)
+
+            with caplog.at_level('ERROR', logger=modern_chat.__name__):
+                db._write_batch([good_1, bad, good_2])
+
+            assert [row[4] for row in db.get_session_history('s1')] == ['ok 1', 'ok 2']
+            assert db.get_session_history('s2') == []
+            assert bad[0] in caplog.text and 's2' in caplog.text
+        finally:
+            db.conn.close()
+
+    def test_enqueued_bad_row_keeps_other_messages(self, tmp_path):
+        """Mensagens válidas enfileiradas junto com uma inválida são gravadas"""
+        db = modern_chat.ChatHistoryDB(str(tmp_path / 'chat_history.db'))
+        try:
+            db.enqueue_message('s1', 'user', 'ok 1')
+            db.enqueue_message('s1', 'user', 'ruim', metadata='{json inválido')
+            db.enqueue_message('s1', 'user', 'ok 2')
+            db.flush()
+
+            assert [row[4] for row in db.get_session_history('s1')] == ['ok 1', 'ok 2']
+        finally:
+            db.conn.close()